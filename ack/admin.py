@@ -149,6 +149,19 @@ class CustomerReviewAdmin(admin.ModelAdmin):
         queryset.update(status='replied')
     mark_as_replied.short_description = "Mark selected reviews as replied"
 
+@admin.register(MediaJob)
+class MediaJobAdmin(admin.ModelAdmin):
+    list_display = ['model', 'object_id', 'field_name', 'status', 'attempts', 'created_at', 'updated_at']
+    list_filter = ['status', 'model']
+    search_fields = ['file_name', 'last_error']
+    readonly_fields = ['model', 'object_id', 'field_name', 'file_name', 'attempts', 'last_error', 'created_at', 'updated_at']
+
+    actions = ['retry']
+
+    def retry(self, request, queryset):
+        queryset.exclude(status=MediaJob.RUNNING).update(status=MediaJob.PENDING, attempts=0)
+    retry.short_description = "Queue selected jobs again"
+
 
 class CustomAdminSite(admin.AdminSite):
     def index(self, request, extra_context=None):
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AckConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ack'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,63 @@
+import secrets
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+MODEL_VERSION_KEY = 'ack:model-version:{}'
+
+
+def _model_version_key(model):
+    return MODEL_VERSION_KEY.format(model._meta.label_lower)
+
+
+def _initial_version():
+    # Random rather than 1: a version lost in a cache flush must never be
+    # handed out again, or ETags and in-process lists from before the flush
+    # would match different content
+    return secrets.randbits(48)
+
+
+def is_shared_cache():
+    """
+    Does every process see the same cache? Not with LocMemCache, where a bump
+    in one process leaves the others serving what they cached before.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def get_model_versions(*models):
+    """Return the current content version of each model (one cache round trip)"""
+    keys = [_model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # First request after a cache flush: start afresh, unless another
+            # process just did
+            version = _initial_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            versions[key] = version
+
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """Invalidate everything cached against this model, in every process sharing the cache"""
+    key = _model_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def content_version(*models):
+    """Single version string covering all the given models, for use in cache keys"""
+    return '.'.join(str(version) for version in get_model_versions(*models))
+
+
+def home_fragment_timeout():
+    """How long the home page fragments live before the upcoming filter is re-run"""
+    return getattr(settings, 'HOME_FRAGMENT_CACHE_TIMEOUT', 300)
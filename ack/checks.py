@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .cache import is_shared_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Content versions only invalidate other processes through a shared cache"""
+    if settings.DEBUG or is_shared_cache():
+        return []
+    return [Warning(
+        "The default cache is per-process, so the full-page cache and version-based "
+        "ETags are switched off and cached fragments only expire by timeout.",
+        hint="Set REDIS_URL so every web worker, management command and the media worker share one cache.",
+        id='ack.W001',
+    )]
@@ -0,0 +1,358 @@
+"""
+Synthetic data for load and performance testing.
+
+Everything is inserted with ``bulk_create`` in fixed-size batches, so memory
+stays flat however many rows are asked for, and every value is drawn from a
+seeded ``random.Random`` so the same seed and scale give the same rows. Dates
+are spread around midnight (UTC) of the day of the run, so upcoming events stay
+upcoming; runs on different days shift them accordingly.
+"""
+import datetime
+import io
+import itertools
+import random
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_model_version
+
+
+FIRST_NAMES = [
+    'Wanjiku', 'Kiprono', 'Achieng', 'Mutua', 'Njeri', 'Otieno', 'Chebet', 'Kamau',
+    'Akinyi', 'Kiptoo', 'Wambui', 'Omondi', 'Jepkoech', 'Mwangi', 'Atieno', 'Kibet',
+]
+LAST_NAMES = [
+    'Kariuki', 'Rotich', 'Odhiambo', 'Musyoka', 'Waweru', 'Ochieng', 'Cheruiyot', 'Njoroge',
+    'Korir', 'Wafula', 'Kimani', 'Too', 'Nyambura', 'Barasa', 'Langat', 'Maina',
+]
+LOCATIONS = ['Main Sanctuary', 'Church Hall', 'Youth Room', 'Church Chapel', 'Choir Loft', 'Church Grounds']
+WORDS = (
+    'grace faith hope love prayer worship praise fellowship community service family '
+    'youth children mothers men choir revival word light peace joy mission outreach'
+).split()
+
+PLACEHOLDER_COLOURS = ['#8b1538', '#1f4e79', '#2e7d32', '#f9a825', '#6a1b9a', '#455a64']
+PLACEHOLDER_NAME = 'placeholders/datagen-{}.png'
+PLACEHOLDER_SIZE = (1200, 800)
+
+# Rows generated per unit of ``scale``; a scale of 100,000 gives roughly a million rows
+VOLUMES = {
+    'events': 1,
+    'sermons': 1,
+    'gallery': 2,
+    'leaders': 0.001,
+    'youth_events': 0.1,
+    'youth_gallery': 0.5,
+    'mu_events': 0.1,
+    'members': 2,
+    'programs': 0.05,
+    'sunday_school_registrations': 1,
+    'music_registrations': 0.5,
+    'mu_memberships': 0.5,
+    'interest_forms': 1.5,
+}
+
+
+def placeholder_images():
+    """
+    Store one small PNG per colour and return their names, shared by all generated rows.
+
+    The PNGs come out byte-identical every run, so the content-addressed
+    storage hands back the blobs saved by earlier runs instead of new copies.
+    """
+    from PIL import Image
+
+    names = []
+    for i, colour in enumerate(PLACEHOLDER_COLOURS):
+        buffer = io.BytesIO()
+        Image.new('RGB', PLACEHOLDER_SIZE, colour).save(buffer, 'PNG')
+        names.append(default_storage.save(PLACEHOLDER_NAME.format(i), ContentFile(buffer.getvalue())))
+    return names
+
+
+def bulk_insert(model, objects, batch_size):
+    """``bulk_create`` a generator without materialising it; returns the row count"""
+    total = 0
+    while True:
+        batch = list(itertools.islice(objects, batch_size))
+        if not batch:
+            return total
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+
+
+class DataGenerator:
+    def __init__(self, scale, seed=0, batch_size=5000):
+        self.scale = scale
+        self.seed = seed
+        self.batch_size = batch_size
+        self.now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def count(self, key):
+        return max(1, int(self.scale * VOLUMES[key]))
+
+    def total_rows(self):
+        """Rows a full run inserts at this scale"""
+        return sum(self.count(key) for key in VOLUMES)
+
+    def rng(self, key):
+        # One stream per table, so changing one table's volume doesn't reshuffle the others
+        return random.Random(f'{self.seed}:{key}')
+
+    def generate(self, only=None, progress=None):
+        """
+        Insert every table (or just those in ``only``) and return ``{key: rows}``.
+
+        ``progress`` is called with ``(key, rows)`` after each table.
+        """
+        from ministries.models import create_sample_ministries, create_sample_programs
+
+        # Seed the real ministries the site is built around before piling rows on
+        create_sample_ministries()
+        create_sample_programs()
+        self.images = placeholder_images()
+
+        counts = {}
+        for key in VOLUMES:
+            if only and key not in only:
+                continue
+            model, objects = getattr(self, f'make_{key}')(self.rng(key), self.count(key))
+            with transaction.atomic():
+                counts[key] = bulk_insert(model, objects, self.batch_size)
+            # bulk_create sends no post_save, so cached pages won't notice on their own
+            bump_model_version(model)
+            if progress:
+                progress(key, counts[key])
+        return counts
+
+    # Field helpers
+
+    def name(self, rng):
+        return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+    def sentence(self, rng, words=12):
+        return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def phone(self, rng):
+        return f'+2547{rng.randrange(10 ** 8):08d}'
+
+    def moment(self, rng, past_days=730, future_days=180):
+        return self.now + datetime.timedelta(minutes=rng.randrange(-past_days * 1440, future_days * 1440))
+
+    def choice(self, rng, choices):
+        return rng.choice(choices)[0]
+
+    def emails(self, prefix, model):
+        """
+        ``prefix-<seed>-<n>@example.com`` for n counting on from the rows
+        already in ``model``, so repeated runs never reuse an address
+        """
+        start = model.objects.count()
+        return (f'{prefix}-{self.seed}-{start + i}@example.com' for i in itertools.count())
+
+    def image(self, rng, probability=1):
+        """Image field values: a placeholder with its stored dimensions, or nothing"""
+        if rng.random() >= probability:
+            return {}
+        width, height = PLACEHOLDER_SIZE
+        return {'image': rng.choice(self.images), 'image_width': width, 'image_height': height}
+
+    # Tables
+
+    def make_events(self, rng, count):
+        from .models import Event
+
+        return Event, (
+            Event(
+                title=f'{self.sentence(rng, 3)[:-1]} {i}',
+                description=self.sentence(rng, 40),
+                date=self.moment(rng),
+                location=rng.choice(LOCATIONS),
+                event_type=self.choice(rng, Event.EVENT_TYPES),
+                **self.image(rng, 0.7),
+            )
+            for i in range(count)
+        )
+
+    def make_sermons(self, rng, count):
+        from .models import SermonEvent
+
+        return SermonEvent, (
+            SermonEvent(
+                title=f'{self.sentence(rng, 4)[:-1]} {i}',
+                event_type=self.choice(rng, SermonEvent.EVENT_TYPES),
+                event_date=self.moment(rng).date(),
+                description=self.sentence(rng, 60),
+                **self.image(rng, 0.5),
+                is_active=rng.random() < 0.95,
+            )
+            for i in range(count)
+        )
+
+    def make_gallery(self, rng, count):
+        from .models import Gallery
+
+        return Gallery, (
+            Gallery(
+                title=f'{self.sentence(rng, 3)[:-1]} {i}',
+                **self.image(rng),
+                category=self.choice(rng, Gallery.CATEGORY_CHOICES),
+                description=self.sentence(rng, 15),
+                event_date=self.moment(rng, future_days=0).date(),
+                is_featured=rng.random() < 0.05,
+            )
+            for i in range(count)
+        )
+
+    def make_leaders(self, rng, count):
+        from .models import Leader
+
+        return Leader, (
+            Leader(
+                name=self.name(rng),
+                position=self.choice(rng, Leader.POSITION_CHOICES),
+                bio=self.sentence(rng, 40),
+                **self.image(rng),
+                order=i,
+            )
+            for i in range(count)
+        )
+
+    def make_youth_events(self, rng, count):
+        from ministries.models import YouthEvent
+
+        return YouthEvent, (
+            YouthEvent(
+                title=f'{self.sentence(rng, 3)[:-1]} {i}',
+                description=self.sentence(rng, 30),
+                event_date=self.moment(rng),
+                start_time=datetime.time(rng.randrange(8, 18)),
+                end_time=datetime.time(rng.randrange(18, 22)),
+                location=rng.choice(LOCATIONS),
+                is_upcoming=rng.random() < 0.3,
+            )
+            for i in range(count)
+        )
+
+    def make_youth_gallery(self, rng, count):
+        from ministries.models import YouthGallery
+
+        return YouthGallery, (
+            YouthGallery(title=f'{self.sentence(rng, 3)[:-1]} {i}', **self.image(rng))
+            for i in range(count)
+        )
+
+    def make_mu_events(self, rng, count):
+        from ministries.models import MothersUnionEvent
+
+        return MothersUnionEvent, (
+            MothersUnionEvent(
+                title=f'{self.sentence(rng, 3)[:-1]} {i}',
+                description=self.sentence(rng, 30),
+                date=self.moment(rng).date(),
+                location=rng.choice(LOCATIONS),
+            )
+            for i in range(count)
+        )
+
+    def make_members(self, rng, count):
+        from ministries.models import Ministry, MinistryMember
+
+        ministries = list(Ministry.objects.order_by('pk'))
+        # (email, ministry) is unique, so addresses must not repeat across runs either
+        emails = self.emails('member', MinistryMember)
+        return MinistryMember, (
+            MinistryMember(
+                ministry=rng.choice(ministries),
+                full_name=self.name(rng),
+                email=next(emails),
+                phone_number=self.phone(rng),
+                role=rng.choices(['member', 'volunteer', 'assistant_leader', 'leader'], [90, 7, 2, 1])[0],
+                date_joined=self.moment(rng, past_days=3650, future_days=0).date(),
+                is_active=rng.random() < 0.9,
+            )
+            for _ in range(count)
+        )
+
+    def make_programs(self, rng, count):
+        from ministries.models import Ministry, Program
+
+        ministries = list(Ministry.objects.order_by('pk'))
+        days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+        return Program, (
+            Program(
+                ministry=rng.choice(ministries),
+                name=f'{self.sentence(rng, 2)[:-1]} {i}',
+                description=self.sentence(rng, 20),
+                day_of_week=rng.choice(days),
+                time=f'{rng.randrange(7, 20)}:00',
+                location=rng.choice(LOCATIONS),
+            )
+            for i in range(count)
+        )
+
+    def make_sunday_school_registrations(self, rng, count):
+        from ministries.models import SundaySchoolRegistration
+
+        age_groups = SundaySchoolRegistration.AGE_GROUPS
+        return SundaySchoolRegistration, (
+            SundaySchoolRegistration(
+                child_name=self.name(rng),
+                child_age=rng.randrange(3, 14),
+                age_group=self.choice(rng, age_groups),
+                parent_name=self.name(rng),
+                phone=self.phone(rng),
+                is_contacted=rng.random() < 0.6,
+            )
+            for _ in range(count)
+        )
+
+    def make_music_registrations(self, rng, count):
+        from ministries.models import MusicMinistryRegistration, MusicMinistryTeam
+
+        return MusicMinistryRegistration, (
+            MusicMinistryRegistration(
+                full_name=self.name(rng),
+                phone=self.phone(rng),
+                team=self.choice(rng, MusicMinistryTeam.TEAM_CHOICES),
+                experience=self.choice(rng, MusicMinistryRegistration.EXPERIENCE_CHOICES),
+                instrument=self.choice(rng, MusicMinistryRegistration.INSTRUMENT_CHOICES),
+                message=self.sentence(rng, 20),
+                is_contacted=rng.random() < 0.6,
+            )
+            for _ in range(count)
+        )
+
+    def make_mu_memberships(self, rng, count):
+        from ministries.models import MothersUnionMembership
+
+        emails = self.emails('mu', MothersUnionMembership)
+        return MothersUnionMembership, (
+            MothersUnionMembership(
+                full_name=self.name(rng),
+                email=next(emails),
+                phone=self.phone(rng),
+                message=self.sentence(rng, 20),
+                is_contacted=rng.random() < 0.6,
+            )
+            for _ in range(count)
+        )
+
+    def make_interest_forms(self, rng, count):
+        from ministries.models import InterestFormSubmission
+
+        emails = self.emails('visitor', InterestFormSubmission)
+        return InterestFormSubmission, (
+            InterestFormSubmission(
+                ministry_type=self.choice(rng, InterestFormSubmission.MINISTRY_CHOICES),
+                full_name=self.name(rng),
+                email=next(emails),
+                phone_number=self.phone(rng),
+                message=self.sentence(rng, 20),
+                is_contacted=rng.random() < 0.6,
+            )
+            for _ in range(count)
+        )
@@ -0,0 +1,175 @@
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Model
+from django.utils import timezone, translation
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+
+from .cache import content_version, is_shared_cache
+from .signals import track_model_changes
+
+
+PAGE_CACHE_KEY = 'ack:page:{}:{}'
+
+
+def _page_cache_key(request, version):
+    """Key a page on its path, normalised query string, language and content version"""
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    url = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    language = translation.get_language() or settings.LANGUAGE_CODE
+    return PAGE_CACHE_KEY.format(url, f'{language}.{version}')
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    return not request.user.is_authenticated
+
+
+def _is_cacheable_response(request, response):
+    if response.status_code != 200 or response.streaming:
+        return False
+    # Anything personalised (session, messages, CSRF token) must not be shared
+    if response.cookies or request.META.get('CSRF_COOKIE_USED'):
+        return False
+    return True
+
+
+def cached_page(*models, timeout=None):
+    """
+    Full-page cache for anonymous visitors.
+
+    ``models`` are the models the page renders; saving or deleting a row of any
+    of them bumps its content version, which changes the key and purges the page.
+
+    Pages are only cached when the cache is shared by every process
+    (``is_shared_cache``); with a per-process cache other processes would never
+    see the bump, so the view simply runs every time.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 60)
+
+    for model in models:
+        track_model_changes(model)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not _is_cacheable_request(request) or not is_shared_cache():
+                return view_func(request, *args, **kwargs)
+
+            key = _page_cache_key(request, content_version(*models))
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+            if _is_cacheable_response(request, response):
+                if hasattr(response, 'render') and callable(response.render):
+                    response.add_post_render_callback(lambda r: cache.set(key, r, timeout))
+                else:
+                    cache.set(key, response, timeout)
+            return response
+        return _wrapped_view
+    return decorator
+
+
+def _has_updated_at(model):
+    return any(field.name == 'updated_at' for field in model._meta.fields)
+
+
+def _is_model(source):
+    return isinstance(source, type) and issubclass(source, Model)
+
+
+def _page_fingerprint(request, sources, key=None):
+    """
+    ``(etag, last_modified)`` for the data behind a page, worked out once per request.
+
+    Querysets over models with an ``updated_at`` column contribute
+    ``Max(updated_at)`` and a row count (the count catches deletions). Models,
+    and querysets over models without ``updated_at``, contribute their content
+    version, which costs no query but also gives no usable Last-Modified.
+    Content versions are only trusted on a shared cache; otherwise such pages
+    get no validators at all.
+    """
+    if getattr(request, '_page_fingerprint', None) is None:
+        # Pages show relative dates ("Happening Today!"), so validators expire daily
+        parts = [timezone.localdate().isoformat()]
+        if key is not None:
+            parts.append(str(key(request)))
+        timestamps = []
+
+        for source in sources:
+            if _is_model(source):
+                model, queryset = source, None
+            else:
+                queryset = source(request) if callable(source) else source
+                model = queryset.model
+            if queryset is not None and _has_updated_at(model):
+                stats = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+                parts.append(f"{model._meta.label_lower}:{stats['count']}:{stats['last']}")
+                timestamps.append(stats['last'])
+            elif is_shared_cache():
+                parts.append(f'{model._meta.label_lower}:v{content_version(model)}')
+                timestamps.append(None)
+            else:
+                parts = timestamps = None
+                break
+
+        if parts is None:
+            request._page_fingerprint = (None, None)
+        else:
+            etag = hashlib.md5('|'.join(parts).encode()).hexdigest()
+            last_modified = max(timestamps) if timestamps and None not in timestamps else None
+            request._page_fingerprint = (etag, last_modified)
+    return request._page_fingerprint
+
+
+def conditional_page(*sources, models=(), key=None):
+    """
+    Send ETag/Last-Modified for a page and answer 304 before the view renders.
+
+    Each source is a model, a queryset, or a callable taking the request and
+    returning a queryset (use a callable when the filter depends on the current
+    time). Models cost no query: they are fingerprinted by content version
+    alone, so prefer them for pages on the hot path. Pass the models of
+    callable sources that have no ``updated_at`` in ``models`` so their changes
+    are tracked. ``key``, a callable taking the request, adds anything else the
+    page depends on (such as the upcoming-events cutoff) to the ETag.
+    """
+    tracked = list(models)
+    for source in sources:
+        if _is_model(source):
+            tracked.append(source)
+        elif not callable(source) and not _has_updated_at(source.model):
+            tracked.append(source.model)
+    for model in tracked:
+        track_model_changes(model)
+
+    def etag_func(request, *args, **kwargs):
+        return _page_fingerprint(request, sources, key)[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        return _page_fingerprint(request, sources, key)[1]
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def query_budget(max_queries):
+    """
+    Declare how many SQL queries a view may run per request.
+
+    Works on view functions, on APIView/ViewSet classes and, through
+    ``method_decorator``, on single ViewSet actions. Over-budget requests
+    are logged by QueryBudgetMiddleware and fail ack.testing.QueryBudgetMixin.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
@@ -0,0 +1,152 @@
+"""
+Metadata and previews for uploaded documents (PDF, Word).
+
+A FileField ``<name>`` opts in by having any of these next to it::
+
+    <name>_size          size in bytes, set as the upload is saved
+    <name>_page_count    number of pages
+    <name>_preview       SizedImageField with the first page rendered as an image
+
+Page count and preview are filled in by the media worker (``ack.jobs``).
+PDF pages are rendered with pypdfium2 when it is installed; Word documents
+only get the page count Word recorded in the file.
+"""
+import io
+import os
+import re
+import zipfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import FileField, ImageField
+
+DOCX_PAGES_RE = re.compile(rb'<Pages>(\d+)</Pages>')
+
+
+def preview_width():
+    return getattr(settings, 'DOCUMENT_PREVIEW_WIDTH', 480)
+
+
+def companion_attname(model, attname, suffix):
+    """``<attname>_<suffix>`` if ``model`` has such a field"""
+    name = f'{attname}_{suffix}'
+    return name if any(field.attname == name for field in model._meta.fields) else None
+
+
+def document_fields(model):
+    """FileFields (not images) of ``model`` that store document metadata"""
+    return [
+        field for field in model._meta.fields
+        if isinstance(field, FileField) and not isinstance(field, ImageField)
+        and any(companion_attname(model, field.attname, suffix) for suffix in ('size', 'page_count', 'preview'))
+    ]
+
+
+def _open_pdf(f):
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    return pypdfium2.PdfDocument(f)
+
+
+def pdf_info(fieldfile, render_preview=True):
+    """``(page count, first page as a PIL image)`` of a PDF; ``(None, None)`` without pypdfium2"""
+    with fieldfile.storage.open(fieldfile.name, 'rb') as f:
+        pdf = _open_pdf(f)
+        if pdf is None:
+            return None, None
+        try:
+            pages = len(pdf)
+            image = None
+            if render_preview and pages:
+                page = pdf[0]
+                image = page.render(scale=preview_width() / page.get_width()).to_pil()
+                page.close()
+        finally:
+            pdf.close()
+    return pages, image
+
+
+def docx_pages(fieldfile):
+    """Page count Word saved in docProps/app.xml, if any"""
+    with fieldfile.storage.open(fieldfile.name, 'rb') as f:
+        try:
+            with zipfile.ZipFile(f) as docx:
+                match = DOCX_PAGES_RE.search(docx.read('docProps/app.xml'))
+        except (zipfile.BadZipFile, KeyError):
+            return None
+    return int(match.group(1)) if match else None
+
+
+def save_preview(field, name, image):
+    """Store ``image`` as a WebP in ``field``'s upload_to and return its stored name"""
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, 'WEBP', quality=75, method=4)
+    root, _ = os.path.splitext(os.path.basename(name))
+    return field.storage.save(field.generate_filename(None, f'{root}.webp'), ContentFile(buffer.getvalue()))
+
+
+def update_document(model, pk, attname, name):
+    """Compute and store page count and preview for one row's document"""
+    from .cache import bump_model_version
+    from .storage import release_blob
+
+    field = model._meta.get_field(attname)
+    fieldfile = field.attr_class(None, field, name)
+    preview_attname = companion_attname(model, attname, 'preview')
+    ext = os.path.splitext(name)[1].lower()
+
+    values = {}
+    pages = image = None
+    if ext == '.pdf':
+        pages, image = pdf_info(fieldfile, render_preview=bool(preview_attname))
+    elif ext == '.docx':
+        pages = docx_pages(fieldfile)
+    if companion_attname(model, attname, 'size'):
+        values[f'{attname}_size'] = fieldfile.storage.size(name)
+    if companion_attname(model, attname, 'page_count'):
+        values[f'{attname}_page_count'] = pages
+
+    old_preview = None
+    if preview_attname:
+        old_preview = model._default_manager.filter(pk=pk).values_list(preview_attname, flat=True).first()
+        preview_field = model._meta.get_field(preview_attname)
+        values[preview_attname] = save_preview(preview_field, name, image) if image else ''
+        if image and preview_field.width_field and preview_field.height_field:
+            values[preview_field.width_field], values[preview_field.height_field] = image.size
+
+    # Only if the document is still the one we read; it may have been replaced meanwhile
+    updated = model._default_manager.filter(pk=pk, **{attname: name}).update(**values)
+    if old_preview and updated and old_preview != values.get(preview_attname):
+        release_blob(old_preview)
+    bump_model_version(model)
+    return bool(updated)
+
+
+def record_uploads(sender, instance, **kwargs):
+    """pre_save: size new document uploads, clear what's stale and remember them for the worker"""
+    instance._new_document_uploads = []
+    for field in document_fields(sender):
+        fieldfile = getattr(instance, field.attname)
+        if fieldfile and fieldfile._committed:
+            continue
+        if companion_attname(sender, field.attname, 'size'):
+            setattr(instance, f'{field.attname}_size', fieldfile.size if fieldfile else None)
+        if companion_attname(sender, field.attname, 'page_count'):
+            setattr(instance, f'{field.attname}_page_count', None)
+        preview_attname = companion_attname(sender, field.attname, 'preview')
+        if preview_attname:
+            # The old preview's blob is released with the rest of the replaced files
+            setattr(instance, preview_attname, '')
+        if fieldfile:
+            instance._new_document_uploads.append(field.attname)
+
+
+def documents_on_save(sender, instance, **kwargs):
+    """post_save: queue page count and preview for the documents uploaded by this save"""
+    from .jobs import enqueue
+
+    for attname in getattr(instance, '_new_document_uploads', ()):
+        enqueue(sender, instance.pk, attname, getattr(instance, attname).name)
+    instance._new_document_uploads = []
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class SizedImageField(models.ImageField):
+    """
+    ImageField whose ``width_field``/``height_field`` are only ever read from uploads.
+
+    Django's ImageField fills empty dimension fields from the file whenever a
+    row is loaded or an image is assigned, which opens the file, and fails if
+    it is missing. Here stored files are never opened: dimensions come from
+    new uploads, and rows saved before the dimension fields existed are filled
+    in by ``manage.py backfill_image_dimensions``.
+    """
+
+    def update_dimension_fields(self, instance, force=False, *args, **kwargs):
+        if self.attname not in instance.__dict__:
+            return
+        file = getattr(instance, self.attname)
+        if file and file._committed:
+            return
+        super().update_dimension_fields(instance, force, *args, **kwargs)
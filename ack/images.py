@@ -0,0 +1,375 @@
+"""
+Fixed-width renditions of uploaded images, for ``srcset`` and ``<picture>``.
+
+Renditions live under ``renditions/`` with the width in the name
+(``renditions/gallery/photo.640w.jpg``). Each width is written as JPEG (PNG
+for transparent images) plus every modern format Pillow can encode here
+(AVIF, WebP). What exists for each image is kept in the cache, so templates
+never touch storage.
+"""
+import base64
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.images import get_image_dimensions
+from django.db.models import ImageField
+
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = 'renditions'
+RENDITIONS_KEY = 'ack:renditions:v2:{}'
+
+
+def rendition_widths():
+    return sorted(getattr(settings, 'IMAGE_RENDITION_WIDTHS', [320, 640, 1024]))
+
+
+def rendition_quality():
+    return getattr(settings, 'IMAGE_RENDITION_QUALITY', 80)
+
+
+def manifest_retry():
+    """Seconds an image with no renditions yet is trusted to still have none"""
+    return getattr(settings, 'IMAGE_MANIFEST_RETRY', 60)
+
+
+# (Pillow format, extension, MIME type), best compression first
+MODERN_FORMATS = [
+    ('AVIF', 'avif', 'image/avif'),
+    ('WEBP', 'webp', 'image/webp'),
+]
+FALLBACK_EXTENSIONS = ('jpg', 'png')
+
+
+def modern_formats():
+    """The MODERN_FORMATS enabled in settings that this Pillow build can encode"""
+    from PIL import Image
+
+    Image.init()
+    enabled = getattr(settings, 'IMAGE_MODERN_FORMATS', ['avif', 'webp'])
+    return [fmt for fmt in MODERN_FORMATS if fmt[1] in enabled and fmt[0] in Image.SAVE]
+
+
+def _save_options(fmt):
+    if fmt == 'AVIF':
+        return {'quality': getattr(settings, 'IMAGE_AVIF_QUALITY', 60)}
+    if fmt == 'PNG':
+        return {'optimize': True}
+    return {'quality': rendition_quality(), 'optimize': fmt == 'JPEG', 'method': 4}
+
+
+def rendition_name(name, width, ext):
+    root, _ = os.path.splitext(name)
+    return f'{RENDITIONS_DIR}/{root}.{width}w.{ext}'
+
+
+def _output_format(image):
+    """Keep transparency as PNG; everything else is re-encoded as JPEG"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        return 'PNG', 'png'
+    return 'JPEG', 'jpg'
+
+
+def _manifest_key(name):
+    return RENDITIONS_KEY.format(name)
+
+
+def image_manifest(name, storage, width=None):
+    """
+    What's stored for an image, as::
+
+        {'width': original width,
+         'renditions': [(width, name), ...],              # JPEG/PNG
+         'sources': [(mime, [(width, name), ...]), ...]}  # AVIF/WebP, incl. full width
+
+    Answered from the cache. On a miss storage is probed and the answer
+    cached; an image with no renditions (yet: the media worker may still be on
+    it) is probed again after IMAGE_MANIFEST_RETRY seconds. Pass the stored
+    ``width`` when known to save opening the original.
+    """
+    key = _manifest_key(name)
+    manifest = cache.get(key)
+    if manifest is None:
+        original_width = width
+        if original_width is None:
+            try:
+                with storage.open(name, 'rb') as f:
+                    original_width, _ = get_image_dimensions(f)
+            except OSError:
+                pass
+
+        renditions = []
+        for width in rendition_widths():
+            for ext in FALLBACK_EXTENSIONS:
+                rendition = rendition_name(name, width, ext)
+                if storage.exists(rendition):
+                    renditions.append((width, rendition))
+                    break
+
+        sources = []
+        widths = [width for width, _ in renditions] + ([original_width] if original_width else [])
+        for _, ext, mime in MODERN_FORMATS:
+            candidates = [(width, rendition_name(name, width, ext)) for width in widths]
+            candidates = [(width, rendition) for width, rendition in candidates if storage.exists(rendition)]
+            if candidates:
+                sources.append((mime, candidates))
+
+        manifest = {'width': original_width, 'renditions': renditions, 'sources': sources}
+        cache.set(key, manifest, timeout=None if renditions or sources else manifest_retry())
+    return manifest
+
+
+def _write(storage, name, image, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **_save_options(fmt))
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_renditions(fieldfile):
+    """
+    Write renditions of ``fieldfile`` at each configured width and return its manifest.
+
+    Fallback renditions skip widths at or above the original's, which the
+    original covers; modern formats are also written at the original width.
+    """
+    from PIL import Image, ImageOps
+
+    storage = fieldfile.storage
+    with storage.open(fieldfile.name, 'rb') as f:
+        image = Image.open(f)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    fmt, ext = _output_format(image)
+    image = image.convert('RGBA' if fmt == 'PNG' else 'RGB')
+
+    sizes = []
+    for width in rendition_widths():
+        if width >= image.width:
+            break
+        height = round(image.height * width / image.width)
+        sizes.append((width, image.resize((width, height), Image.LANCZOS)))
+
+    renditions = []
+    for width, resized in sizes:
+        name = rendition_name(fieldfile.name, width, ext)
+        _write(storage, name, resized, fmt)
+        renditions.append((width, name))
+
+    sources = []
+    for modern_fmt, modern_ext, mime in modern_formats():
+        candidates = []
+        for width, resized in sizes + [(image.width, image)]:
+            name = rendition_name(fieldfile.name, width, modern_ext)
+            _write(storage, name, resized, modern_fmt)
+            candidates.append((width, name))
+        sources.append((mime, candidates))
+
+    manifest = {'width': image.width, 'renditions': renditions, 'sources': sources}
+    cache.set(_manifest_key(fieldfile.name), manifest, timeout=None)
+    return manifest
+
+
+def is_rendered(fieldfile):
+    """Whether ``fieldfile`` already has its renditions, as far as its manifest tells"""
+    manifest = image_manifest(fieldfile.name, fieldfile.storage)
+    if manifest['renditions'] or manifest['sources']:
+        return True
+    # Narrower than the smallest width, and no modern format to write either
+    smallest = rendition_widths()[0]
+    return manifest['width'] is not None and manifest['width'] <= smallest and not modern_formats()
+
+
+def delete_renditions(name, storage):
+    """Remove every rendition of the image stored as ``name``"""
+    manifest = image_manifest(name, storage)
+    names = [rendition for _, rendition in manifest['renditions']]
+    for _, candidates in manifest['sources']:
+        names.extend(rendition for _, rendition in candidates)
+    for rendition in names:
+        storage.delete(rendition)
+    cache.delete(_manifest_key(name))
+
+
+def stored_dimensions(fieldfile):
+    """``(width, height)`` from the model's width_field/height_field, without opening the file"""
+    field, instance = fieldfile.field, fieldfile.instance
+    if instance is None or not getattr(field, 'width_field', None) or not getattr(field, 'height_field', None):
+        return None, None
+    return getattr(instance, field.width_field), getattr(instance, field.height_field)
+
+
+def _srcset(storage, candidates):
+    return ', '.join(f'{storage.url(name)} {width}w' for width, name in candidates)
+
+
+def srcset(fieldfile):
+    """``srcset`` value for an image: its renditions plus the original at full width"""
+    if not fieldfile:
+        return ''
+    manifest = image_manifest(fieldfile.name, fieldfile.storage, stored_dimensions(fieldfile)[0])
+    if not manifest['renditions']:
+        return ''
+    candidates = list(manifest['renditions'])
+    if manifest['width']:
+        candidates.append((manifest['width'], fieldfile.name))
+    return _srcset(fieldfile.storage, candidates)
+
+
+def picture_sources(fieldfile):
+    """``[(mime, srcset), ...]`` for the ``<source>`` elements of a ``<picture>``"""
+    if not fieldfile:
+        return []
+    manifest = image_manifest(fieldfile.name, fieldfile.storage, stored_dimensions(fieldfile)[0])
+    return [(mime, _srcset(fieldfile.storage, candidates)) for mime, candidates in manifest['sources']]
+
+
+def image_fields(model):
+    return [field for field in model._meta.fields if isinstance(field, ImageField)]
+
+
+def upload_max_dimension():
+    return getattr(settings, 'IMAGE_UPLOAD_MAX_DIMENSION', 2048)
+
+
+def upload_quality():
+    return getattr(settings, 'IMAGE_UPLOAD_QUALITY', 85)
+
+
+def normalise_upload(fieldfile):
+    """
+    Rewrite a not-yet-saved upload as a web-sized original.
+
+    Applies the EXIF orientation, drops all metadata except the colour
+    profile, caps the longest side at IMAGE_UPLOAD_MAX_DIMENSION and
+    recompresses. Opaque PNGs become JPEGs when that halves their size.
+    Animated images are left alone.
+    """
+    from PIL import Image, ImageOps
+
+    upload = fieldfile.file
+    upload.seek(0)
+    image = Image.open(upload)
+    if getattr(image, 'is_animated', False):
+        upload.seek(0)
+        return
+    image.load()
+    icc_profile = image.info.get('icc_profile')
+    has_metadata = bool(image.getexif()) or any(key in image.info for key in ('exif', 'xmp', 'XML:com.adobe.xmp'))
+    size = image.size
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((upload_max_dimension(), upload_max_dimension()), Image.LANCZOS)
+    untouched = not has_metadata and image.size == size
+
+    fmt, ext = _output_format(image)
+    if fmt == 'PNG':
+        encoded = _encode(image.convert('RGBA'), 'PNG', icc_profile)
+    else:
+        encoded = _encode(image.convert('RGB'), 'JPEG', icc_profile)
+        if os.path.splitext(fieldfile.name)[1].lower() == '.png':
+            # Screenshots compress better as PNG; only switch when JPEG clearly wins
+            png = _encode(image.convert('RGB'), 'PNG', icc_profile)
+            if len(png) <= 2 * len(encoded):
+                encoded, ext = png, 'png'
+
+    upload.seek(0, os.SEEK_END)
+    if untouched and len(encoded) >= upload.tell():
+        # Already clean and web-sized (e.g. WhatsApp exports); re-encoding would only grow it
+        upload.seek(0)
+        return
+
+    root, _ = os.path.splitext(fieldfile.name)
+    name = f'{root}.{ext}'
+    fieldfile.file = ContentFile(encoded, name=os.path.basename(name))
+    fieldfile.name = name
+    # Let width_field/height_field pick up the new size
+    fieldfile.__dict__.pop('_dimensions_cache', None)
+
+
+def _encode(image, fmt, icc_profile=None):
+    buffer = io.BytesIO()
+    options = {'optimize': True}
+    if fmt == 'JPEG':
+        options.update(quality=upload_quality(), progressive=True)
+    if icc_profile:
+        options['icc_profile'] = icc_profile
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def placeholder_width():
+    return getattr(settings, 'IMAGE_PLACEHOLDER_WIDTH', 16)
+
+
+def placeholder_attname(model, attname):
+    """The ``<image>_placeholder`` field stored next to an image field, if the model has one"""
+    name = f'{attname}_placeholder'
+    return name if any(field.attname == name for field in model._meta.fields) else None
+
+
+def make_placeholder(fieldfile):
+    """A few-hundred-byte blurred thumbnail of the image, as a data: URI"""
+    from PIL import Image, ImageFilter, ImageOps
+
+    with fieldfile.storage.open(fieldfile.name, 'rb') as f:
+        image = Image.open(f)
+        image.draft('RGB', (placeholder_width() * 4, placeholder_width() * 4))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+    image.thumbnail((placeholder_width(), placeholder_width()), Image.LANCZOS)
+    image = image.filter(ImageFilter.GaussianBlur(0.5))
+    # WebP headers are far smaller than JPEG's quantisation tables at this size
+    fmt, mime = ('WEBP', 'image/webp') if 'WEBP' in Image.SAVE else ('JPEG', 'image/jpeg')
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, quality=50)
+    return f'data:{mime};base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def update_placeholder(model, pk, attname):
+    """Compute and store the placeholder for one row's image"""
+    from .cache import bump_model_version
+
+    field = model._meta.get_field(attname)
+    name = model._default_manager.filter(pk=pk).values_list(attname, flat=True).first()
+    if not name:
+        return
+    placeholder = make_placeholder(field.attr_class(None, field, name))
+    # Only if the image is still the one we rendered; it may have been replaced meanwhile
+    model._default_manager.filter(pk=pk, **{attname: name}).update(
+        **{placeholder_attname(model, attname): placeholder}
+    )
+    bump_model_version(model)
+
+
+def process_uploads(sender, instance, **kwargs):
+    """pre_save: normalise new image uploads and remember them for renditions"""
+    instance._new_image_uploads = []
+    for field in image_fields(sender):
+        fieldfile = getattr(instance, field.attname)
+        placeholder = placeholder_attname(sender, field.attname)
+        if placeholder and (not fieldfile or not fieldfile._committed):
+            # Recomputed by the media worker after a new upload
+            setattr(instance, placeholder, '')
+        if not fieldfile or fieldfile._committed:
+            continue
+        try:
+            normalise_upload(fieldfile)
+            field.update_dimension_fields(instance, force=True)
+        except Exception:
+            # Store the file as uploaded rather than refuse the save
+            logger.exception("Could not normalise %s", fieldfile.name)
+        instance._new_image_uploads.append(field.attname)
+
+
+def renditions_on_save(sender, instance, **kwargs):
+    """post_save: queue renditions and placeholders for the images uploaded by this save"""
+    from .jobs import enqueue
+
+    for attname in getattr(instance, '_new_image_uploads', ()):
+        enqueue(sender, instance.pk, attname, getattr(instance, attname).name)
+    instance._new_image_uploads = []
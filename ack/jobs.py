@@ -0,0 +1,146 @@
+"""
+Durable queue for processing uploads.
+
+Saving an upload only records a MediaJob in the same transaction; image
+renditions and placeholders, and document page counts and previews, are made
+by ``manage.py process_media_jobs``, which runs the jobs in a process pool so
+decoding and encoding use every core. Until a job is done templates simply
+show the original image, or no preview. The generate_* commands queue the
+same jobs for files stored before this processing existed.
+"""
+import datetime
+import logging
+import traceback
+
+from django.apps import apps
+from django.db.models import F, ImageField
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(model, pk, attname, name):
+    """Queue processing of the file ``name`` just stored in ``model(pk).<attname>``"""
+    from .models import MediaJob
+
+    return MediaJob.objects.create(
+        model=model._meta.label, object_id=str(pk), field_name=attname, file_name=name,
+    )
+
+
+def enqueue_many(model, attname, rows, batch_size=500):
+    """
+    Queue jobs for ``(pk, name)`` pairs of ``model.<attname>``, skipping files
+    that already have a job pending or running. Returns how many were queued.
+    """
+    from .models import MediaJob
+
+    label = model._meta.label
+    queued = set(
+        MediaJob.objects.filter(model=label, field_name=attname, status__in=[MediaJob.PENDING, MediaJob.RUNNING])
+        .values_list('object_id', 'file_name')
+    )
+    batch, count = [], 0
+    for pk, name in rows:
+        if (str(pk), name) in queued:
+            continue
+        batch.append(MediaJob(model=label, object_id=str(pk), field_name=attname, file_name=name))
+        if len(batch) >= batch_size:
+            count += len(MediaJob.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        count += len(MediaJob.objects.bulk_create(batch))
+    return count
+
+
+def claim_jobs(limit):
+    """
+    Mark up to ``limit`` pending jobs as running and return their ids, oldest first.
+
+    Each job is claimed with a conditional UPDATE, so several workers can share
+    the table without handing the same job out twice.
+    """
+    from .models import MediaJob
+
+    candidates = (
+        MediaJob.objects.filter(status=MediaJob.PENDING)
+        .order_by('created_at').values_list('pk', flat=True)[:limit]
+    )
+    claimed = []
+    for pk in list(candidates):
+        if MediaJob.objects.filter(pk=pk, status=MediaJob.PENDING).update(
+            status=MediaJob.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now(),
+        ):
+            claimed.append(pk)
+    return claimed
+
+
+def requeue_stale_jobs(older_than):
+    """Put back jobs left running by a worker that died; returns how many"""
+    from .models import MediaJob
+
+    cutoff = timezone.now() - datetime.timedelta(seconds=older_than)
+    return MediaJob.objects.filter(status=MediaJob.RUNNING, updated_at__lt=cutoff).update(
+        status=MediaJob.PENDING, updated_at=timezone.now(),
+    )
+
+
+def process_image(model, pk, attname, name):
+    """Render the image and compute its placeholder, unless the row has moved on"""
+    from . import images
+    from .cache import bump_model_version
+
+    field = model._meta.get_field(attname)
+    current = model._default_manager.filter(pk=pk).values_list(attname, flat=True).first()
+    if current != name:
+        # Row deleted or image replaced since; the newer upload has its own job
+        return False
+    fieldfile = field.attr_class(None, field, name)
+    if not images.is_rendered(fieldfile):
+        images.generate_renditions(fieldfile)
+    if images.placeholder_attname(model, attname):
+        images.update_placeholder(model, pk, attname)
+    bump_model_version(model)
+    return True
+
+
+def process_upload(model, pk, attname, name):
+    """Images get renditions and a placeholder, documents their page count and preview"""
+    from . import documents
+
+    if isinstance(model._meta.get_field(attname), ImageField):
+        return process_image(model, pk, attname, name)
+    return documents.update_document(model, pk, attname, name)
+
+
+def run_job(pk, max_attempts=3):
+    """
+    Run one claimed job and record the outcome. Called in worker processes.
+
+    Failures go back to pending until ``max_attempts`` is reached.
+    """
+    from .models import MediaJob
+
+    job = MediaJob.objects.get(pk=pk)
+    try:
+        process_upload(apps.get_model(job.model), job.object_id, job.field_name, job.file_name)
+    except Exception:
+        logger.exception("Media job %s failed", pk)
+        status = MediaJob.FAILED if job.attempts >= max_attempts else MediaJob.PENDING
+        MediaJob.objects.filter(pk=pk).update(
+            status=status, last_error=traceback.format_exc(), updated_at=timezone.now(),
+        )
+        return status
+    MediaJob.objects.filter(pk=pk).update(status=MediaJob.DONE, last_error='', updated_at=timezone.now())
+    return MediaJob.DONE
+
+
+def init_worker():
+    """
+    ProcessPoolExecutor initializer for "spawn" workers, which start without
+    Django set up (hence the function-level model imports in this module).
+    """
+    import django
+
+    django.setup()
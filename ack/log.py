@@ -0,0 +1,150 @@
+"""
+Structured logging: request ids, per-request sampling, JSON lines and a
+batching stdout handler. Wired up in ``settings.LOGGING``.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import zlib
+
+
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIDFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep ``rate`` of the requests' records below WARNING; WARNING and up always pass.
+
+    The decision is made per request id rather than per record, so a sampled
+    request keeps all of its log lines. Records logged outside a request
+    (management commands, the media worker) have no id to share, so each is
+    sampled on its own.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.threshold = int(float(rate) * 10000)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.threshold >= 10000:
+            return True
+        request_id = getattr(record, 'request_id', None) or request_id_var.get()
+        if request_id == '-':
+            return random.randrange(10000) < self.threshold
+        return zlib.crc32(request_id.encode()) % 10000 < self.threshold
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class BatchingHandler(logging.Handler):
+    """
+    Queue records and write them to stdout from a background thread.
+
+    A batch is flushed once it holds ``batch_size`` records or ``flush_interval``
+    seconds have passed. If the queue fills up, records are dropped rather than
+    stalling the request. The writer thread is (re)started lazily so it survives
+    gunicorn forking workers after the handler was configured.
+    """
+
+    def __init__(self, batch_size=50, flush_interval=1.0, max_queue=10000, stream=None):
+        super().__init__()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stream = stream or sys.stdout
+        self.queue = queue.Queue(max_queue)
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def emit(self, record):
+        # Traceback objects can't outlive the request safely; render them now
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def _ensure_writer(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        if lines:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
@@ -0,0 +1,64 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.core.files.images import get_image_dimensions
+from django.core.management.base import BaseCommand
+
+from ack.cache import bump_model_version
+from ack.images import image_fields
+from ack.storage import rows_with_file
+
+
+def read_dimensions(storage, name):
+    """(name, (width, height)) from the image header, or (name, exception)"""
+    try:
+        with storage.open(name, 'rb') as f:
+            return name, get_image_dimensions(f)
+    except Exception as exc:
+        return name, exc
+
+
+class Command(BaseCommand):
+    help = "Fill in width/height fields for images stored before they were tracked."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=min(32, (os.cpu_count() or 1) * 4),
+                            help="Files read in parallel")
+        parser.add_argument('--force', action='store_true', help="Re-read images that already have dimensions")
+
+    def handle(self, *args, **options):
+        # Reading headers is I/O bound, so threads parallelise it fine; all DB work stays here
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for model in apps.get_models():
+                for field in image_fields(model):
+                    if field.width_field and field.height_field:
+                        self.backfill(pool, model, field, options['force'])
+
+    def backfill(self, pool, model, field, force):
+        rows = rows_with_file(model, field)
+        if not force:
+            rows = rows.filter(**{f'{field.width_field}__isnull': True})
+        names = list(rows.values_list(field.attname, flat=True).distinct())
+        if not names:
+            return
+
+        updated = missing = 0
+        by_size = defaultdict(list)
+        for name, result in pool.map(lambda name: read_dimensions(field.storage, name), names):
+            if isinstance(result, Exception) or None in result:
+                missing += 1
+                self.stderr.write(f"  {model._meta.label}.{field.name} {name}: {result}")
+            else:
+                by_size[result].append(name)
+
+        # One UPDATE per distinct size rather than per file
+        for (width, height), size_names in by_size.items():
+            for start in range(0, len(size_names), 500):
+                updated += rows.filter(**{f'{field.attname}__in': size_names[start:start + 500]}).update(
+                    **{field.width_field: width, field.height_field: height}
+                )
+        if updated:
+            bump_model_version(model)
+        self.stdout.write(f"{model._meta.label}.{field.name}: {updated} rows updated, {missing} unreadable")
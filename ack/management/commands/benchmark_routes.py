@@ -0,0 +1,204 @@
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+import types
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import URLResolver, get_resolver, include, path, reverse
+from django.utils import timezone
+
+from ack.datagen import DataGenerator
+from ack.middleware import QueryCounter
+
+
+URLCONFS = ['ack.urls', 'ministries.urls']
+
+# Values for URL parameters that can't be looked up from the view's queryset
+STATIC_KWARGS = {
+    'ministry_type': 'youth',
+}
+
+
+def iter_named_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_named_patterns(pattern.url_patterns)
+        elif pattern.name:
+            yield pattern
+
+
+def view_model(callback):
+    """Model behind a DRF view or viewset, used to find a pk to request"""
+    view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    queryset = getattr(view_class, 'queryset', None)
+    return queryset.model if queryset is not None else None
+
+
+def seed_database(scale):
+    """Fill the (test) database with synthetic content for ``scale``"""
+    DataGenerator(scale).generate()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every named route in ack.urls and ministries.urls against a seeded "
+        "test database and report p50/p95 latency, query count and peak memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100',
+                            help="Comma-separated DataGenerator scales to seed, e.g. 100,10000,100000. "
+                                 "A scale is a multiplier, not a row count: each unit is about 10 rows "
+                                 "across all tables (see ack.datagen.VOLUMES)")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per route")
+        parser.add_argument('--output', help="Write the results to this JSON file")
+        parser.add_argument('--route', action='append', dest='routes',
+                            help="Only benchmark these route names (repeatable)")
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError("--scales must be a comma-separated list of integers")
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1")
+
+        results = {
+            'started_at': timezone.now().isoformat(),
+            'repeat': options['repeat'],
+            'rows': {},
+            'scales': {},
+        }
+        for scale in scales:
+            rows = DataGenerator(scale).total_rows()
+            self.stdout.write(f"Seeding scale {scale} ({rows:,} rows)...")
+            results['rows'][str(scale)] = rows
+            results['scales'][str(scale)] = self.run_scale(scale, options)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def run_scale(self, scale, options):
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # Placeholder images go to a scratch directory, not the real media root
+        media_root = tempfile.TemporaryDirectory(prefix='benchmark-media-')
+        try:
+            with override_settings(MEDIA_ROOT=media_root.name):
+                seed_database(scale)
+                routes = []
+                for urlconf in URLCONFS:
+                    with override_settings(ROOT_URLCONF=self.root_urlconf(urlconf)):
+                        routes.extend(self.benchmark_urlconf(urlconf, options))
+            return routes
+        finally:
+            media_root.cleanup()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def root_urlconf(self, urlconf):
+        """
+        Serve ``urlconf`` at the root, with the site's own URLs behind it.
+
+        The ministries templates reverse site-wide names like 'home', so they
+        only render when those names resolve as well.
+        """
+        module = types.ModuleType(f'benchmark_{urlconf.replace(".", "_")}')
+        module.urlpatterns = [
+            path('', include(urlconf)),
+            path('', include(settings.ROOT_URLCONF)),
+        ]
+        return module
+
+    def benchmark_urlconf(self, urlconf, options):
+        # Broken routes should be reported with their status, not abort the run
+        client = Client(raise_request_exception=False)
+        seen = set()
+        results = []
+
+        for pattern in iter_named_patterns(get_resolver(urlconf).url_patterns):
+            name = pattern.name
+            if name in seen or (options['routes'] and name not in options['routes']):
+                continue
+            seen.add(name)
+
+            path = self.build_path(urlconf, pattern)
+            if path is None:
+                self.stdout.write(self.style.WARNING(f"  skipping {urlconf}:{name} (unknown URL parameters)"))
+                continue
+
+            result = {'urlconf': urlconf, 'name': name, 'path': path}
+            result.update(self.benchmark_path(client, path, options['repeat']))
+            results.append(result)
+            self.stdout.write(
+                f"  {name:<40} {result['status']:>3}  p50 {result['p50_ms']:>8.2f}ms  "
+                f"p95 {result['p95_ms']:>8.2f}ms  {result['queries']:>4} queries  "
+                f"{result['peak_memory_kb']:>8.1f}KB"
+            )
+        return results
+
+    def build_path(self, urlconf, pattern):
+        kwargs = {}
+        for key in pattern.pattern.regex.groupindex:
+            if key == 'format':
+                return None
+            if key in STATIC_KWARGS:
+                kwargs[key] = STATIC_KWARGS[key]
+            elif key == 'pk':
+                model = view_model(pattern.callback)
+                obj = model._default_manager.order_by('pk').first() if model else None
+                if obj is None:
+                    return None
+                kwargs[key] = obj.pk
+            else:
+                return None
+        return reverse(pattern.name, kwargs=kwargs)
+
+    def benchmark_path(self, client, path, repeat):
+        cache.clear()
+        response = client.get(path)  # warm-up, also primes caches the way real traffic would
+
+        timings = []
+        counter = QueryCounter()
+        for _ in range(repeat):
+            counter.count = 0
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                start = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        # Memory is measured on a separate request; tracing would skew the timings
+        tracemalloc.start()
+        try:
+            client.get(path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if len(timings) > 1:
+            percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+            p50, p95 = percentiles[49], percentiles[94]
+        else:
+            p50 = p95 = timings[0]
+
+        return {
+            'status': response.status_code,
+            'p50_ms': round(p50, 3),
+            'p95_ms': round(p95, 3),
+            'queries': counter.count,
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
@@ -0,0 +1,118 @@
+import os
+import re
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ack.images import RENDITIONS_DIR
+from ack.storage import file_fields, rows_with_file
+
+
+QUARANTINE_DIR = '.quarantine'
+
+# renditions/<original without extension>.<width>w.<ext>
+RENDITION_RE = re.compile(rf'^{RENDITIONS_DIR}/(?P<root>.+)\.\d+w\.\w+$')
+
+
+def referenced_roots():
+    """
+    Every stored file name referenced by a FileField/ImageField, minus its extension.
+
+    Names are streamed from the database in chunks; only the set is kept.
+    Extensions are dropped so renditions (which may use a different one) can be
+    matched against their original; at worst that keeps an orphan that only
+    differs from a live file by its extension.
+    """
+    roots = set()
+    for model, field in file_fields():
+        names = rows_with_file(model, field).values_list(field.attname, flat=True).iterator(chunk_size=5000)
+        roots.update(os.path.splitext(name)[0] for name in names)
+    return roots
+
+
+def walk(root, skip=()):
+    """Yield ``(relative path, DirEntry)`` for every file under ``root``, depth first"""
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        with os.scandir(os.path.join(root, relative_dir)) as entries:
+            for entry in entries:
+                relative = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if relative not in skip:
+                        stack.append(relative)
+                elif entry.is_file(follow_symlinks=False):
+                    yield relative, entry
+
+
+def prune_empty_dirs(path, root):
+    """Remove ``path`` and its parents while they are empty, stopping at ``root``"""
+    root = os.path.normpath(root)
+    path = os.path.normpath(path)
+    while path != root and path.startswith(root + os.sep):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
+
+
+def is_referenced(relative, roots):
+    if os.path.splitext(relative)[0] in roots:
+        return True
+    match = RENDITION_RE.match(relative)
+    return bool(match) and match['root'] in roots
+
+
+class Command(BaseCommand):
+    help = (
+        "Find files under MEDIA_ROOT that no FileField/ImageField refers to, "
+        "and report them or move them to MEDIA_ROOT/.quarantine/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quarantine', action='store_true',
+                            help="Move orphans to MEDIA_ROOT/.quarantine/<timestamp>/ instead of only listing them")
+        parser.add_argument('--min-age', type=float, default=24,
+                            help="Ignore files modified in the last N hours (uploads whose row isn't committed yet)")
+        parser.add_argument('--quiet', action='store_true', help="Only print the summary")
+
+    def handle(self, *args, **options):
+        media_root = settings.MEDIA_ROOT
+        if not os.path.isdir(media_root):
+            raise CommandError(f"MEDIA_ROOT {media_root} does not exist")
+
+        roots = referenced_roots()
+        self.stdout.write(f"{len(roots)} referenced files")
+
+        cutoff = time.time() - options['min_age'] * 3600
+        target = None
+        if options['quarantine']:
+            target = os.path.join(media_root, QUARANTINE_DIR, timezone.now().strftime('%Y%m%d-%H%M%S'))
+
+        orphans = orphan_bytes = scanned = 0
+        for relative, entry in walk(media_root, skip={QUARANTINE_DIR}):
+            scanned += 1
+            if is_referenced(relative, roots):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                continue
+
+            orphans += 1
+            orphan_bytes += stat.st_size
+            if not options['quiet']:
+                self.stdout.write(f"  {relative} ({stat.st_size / 1024:.0f}KB)")
+            if target:
+                destination = os.path.join(target, relative)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.move(entry.path, destination)
+                prune_empty_dirs(os.path.dirname(entry.path), media_root)
+
+        summary = f"{scanned} files scanned, {orphans} orphaned ({orphan_bytes / 1024 / 1024:.1f}MB)"
+        if target and orphans:
+            summary += f", moved to {os.path.relpath(target, media_root)}"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,77 @@
+import os
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ack.cache import bump_model_version
+from ack.images import delete_renditions
+from ack.storage import (
+    ContentAddressedStorage, blob_name, content_hash, file_fields, is_blob, is_referenced,
+    rows_with_file,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move uploads saved before content-addressed storage into blobs/, "
+        "pointing every row at the shared blob and deleting the duplicates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be merged")
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("DEFAULT_FILE_STORAGE is not ack.storage.ContentAddressedStorage")
+        dry_run = options['dry_run']
+
+        blobs = {}  # legacy name -> blob name
+        sizes = {}
+        for model, field in file_fields():
+            if not isinstance(field.storage, ContentAddressedStorage):
+                continue
+            column = field.attname
+            names = rows_with_file(model, field).values_list(column, flat=True).distinct()
+            changes = {}
+            for name in names:
+                if is_blob(name):
+                    continue
+                if name not in blobs:
+                    if not default_storage.exists(name):
+                        self.stderr.write(f"  missing: {name} ({model._meta.label}.{field.name})")
+                        continue
+                    blobs[name] = self.store(name, dry_run)
+                    sizes[name] = default_storage.size(name)
+                changes[name] = blobs[name]
+
+            if changes and not dry_run:
+                self.repoint(model, column, changes)
+
+        unique = {blob: sizes[name] for name, blob in blobs.items()}
+        saved = sum(sizes.values()) - sum(unique.values())
+        self.stdout.write(
+            f"{len(blobs)} files -> {len(unique)} blobs, {saved / 1024:.0f}KB of duplicates"
+            + (" (dry run)" if dry_run else "")
+        )
+
+        if not dry_run:
+            for name in blobs:
+                if not is_referenced(name):
+                    delete_renditions(name, default_storage)
+                    default_storage.delete(name)
+            self.stdout.write(self.style.SUCCESS("Legacy copies removed"))
+
+    def store(self, name, dry_run):
+        with default_storage.open(name, 'rb') as f:
+            if dry_run:
+                return blob_name(content_hash(File(f)), os.path.splitext(name)[1])
+            return default_storage.save(name, File(f))
+
+    def repoint(self, model, column, changes):
+        stamp = {'updated_at': timezone.now()} if any(f.name == 'updated_at' for f in model._meta.fields) else {}
+        for old, new in changes.items():
+            # Touch updated_at too, so ETags of pages showing the image change with its URL
+            model._default_manager.filter(**{column: old}).update(**{column: new}, **stamp)
+        bump_model_version(model)
@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from ack import documents, jobs
+from ack.storage import rows_with_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue media jobs for documents uploaded before their size, page count and preview were recorded; "
+        "process_media_jobs fills them in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Queue documents that already have a size too")
+
+    def handle(self, *args, **options):
+        queued = 0
+        for model in apps.get_models():
+            for field in documents.document_fields(model):
+                rows = rows_with_file(model, field)
+                size = documents.companion_attname(model, field.attname, 'size')
+                if not options['force'] and size:
+                    rows = rows.filter(**{f'{size}__isnull': True})
+                queued += jobs.enqueue_many(model, field.attname, rows.values_list('pk', field.attname).iterator())
+
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} jobs; run process_media_jobs to process them"))
@@ -0,0 +1,29 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from ack import images, jobs
+from ack.storage import rows_with_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue media jobs for images without a placeholder (e.g. uploaded before placeholders existed); "
+        "process_media_jobs computes them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Queue images whose placeholder is already set too")
+
+    def handle(self, *args, **options):
+        queued = 0
+        for model in apps.get_models():
+            for field in images.image_fields(model):
+                placeholder = images.placeholder_attname(model, field.attname)
+                if not placeholder:
+                    continue
+                rows = rows_with_file(model, field)
+                if not options['force']:
+                    rows = rows.filter(**{placeholder: ''})
+                queued += jobs.enqueue_many(model, field.attname, rows.values_list('pk', field.attname).iterator())
+
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} jobs; run process_media_jobs to compute them"))
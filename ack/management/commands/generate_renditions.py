@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from ack import images, jobs
+from ack.storage import rows_with_file
+
+
+def needs_rendering(field, rows, force):
+    """The ``(pk, name)`` rows whose image has no renditions yet, checking each file once"""
+    pending = {}
+    for pk, name in rows:
+        if name not in pending:
+            if force:
+                images.delete_renditions(name, field.storage)
+                pending[name] = True
+            else:
+                pending[name] = not images.is_rendered(field.attr_class(None, field, name))
+        if pending[name]:
+            yield pk, name
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue media jobs for images uploaded before renditions existed; "
+        "process_media_jobs renders them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help="Delete existing renditions and queue every image again")
+
+    def handle(self, *args, **options):
+        queued = 0
+        for model in apps.get_models():
+            for field in images.image_fields(model):
+                rows = rows_with_file(model, field).values_list('pk', field.attname).iterator()
+                queued += jobs.enqueue_many(model, field.attname, needs_rendering(field, rows, options['force']))
+
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} jobs; run process_media_jobs to render them"))
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ack import jobs
+from ack.cache import is_shared_cache
+from ack.models import MediaJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued uploads (image renditions and placeholders, document previews) in a pool of processes. "
+        "Runs until interrupted; use --once to drain the queue and exit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int,
+                            default=getattr(settings, 'MEDIA_WORKER_PROCESSES', None) or os.cpu_count(),
+                            help="Worker processes (default: MEDIA_WORKER_PROCESSES, else one per CPU)")
+        parser.add_argument('--once', action='store_true', help="Exit once no jobs are pending")
+        parser.add_argument('--poll-interval', type=float, default=5, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--max-attempts', type=int, default=3, help="Give up on a job after this many failures")
+        parser.add_argument('--stale-after', type=int, default=1800,
+                            help="Requeue jobs left running this many seconds by a worker that died")
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        run = partial(jobs.run_job, max_attempts=options['max_attempts'])
+        done = failed = 0
+        if not is_shared_cache():
+            self.stderr.write(
+                "The cache is per-process: web processes won't see finished jobs until "
+                "IMAGE_MANIFEST_RETRY or their cached pages expire. Set REDIS_URL."
+            )
+
+        # "spawn" so workers never inherit the parent's database connections
+        with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=jobs.init_worker) as pool:
+            while True:
+                requeued = jobs.requeue_stale_jobs(options['stale_after'])
+                if requeued:
+                    self.stdout.write(f"Requeued {requeued} stale jobs")
+
+                # A couple of jobs per process keeps every core busy between batches
+                claimed = jobs.claim_jobs(processes * 2)
+                if not claimed:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                futures = {pool.submit(run, pk): pk for pk in claimed}
+                for future in as_completed(futures):
+                    try:
+                        status = future.result()
+                    except Exception as exc:
+                        # Left running; picked up again once stale
+                        status = exc
+                    if status == MediaJob.DONE:
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(f"  job {futures[future]} {status}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {done} jobs ({failed} failed)"))
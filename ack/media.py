@@ -0,0 +1,201 @@
+"""
+Serving files from MEDIA_ROOT.
+
+In production the proxy does the transfer: the view only checks the request
+and answers with ``X-Accel-Redirect`` (nginx) or ``X-Sendfile`` (Apache,
+lighttpd), per ``MEDIA_ACCEL``. Without a proxy it falls back to a
+FileResponse, which the WSGI server can hand to ``sendfile()`` via
+``wsgi.file_wrapper``, with single-range ``Range`` support.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+from .images import RENDITIONS_DIR
+from .storage import BLOBS_DIR, is_published
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# A blob, or a rendition of one: the digest says which
+BLOB_PATH_RE = re.compile(rf'^(?:{RENDITIONS_DIR}/)?{BLOBS_DIR}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/([0-9a-f]{{64}})(?:\.|$)')
+
+# Named after their content, so they can be cached forever
+IMMUTABLE_PREFIXES = (f'{BLOBS_DIR}/', f'renditions/{BLOBS_DIR}/')
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) for a single-range ``Range`` header, or None
+    when the header is absent or not something we serve partially.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+class RangeFile:
+    """Read-only view of ``length`` bytes of a file from ``start`` onwards"""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def file_response(request, full_path, content_type=None, as_attachment=False, filename=None,
+                  cache_control=None):
+    """
+    FileResponse for a local file that honours If-Modified-Since and Range.
+
+    Full responses pass the real file object, so servers with
+    ``wsgi.file_wrapper`` can use sendfile(); partial ones are streamed.
+    """
+    try:
+        st = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File does not exist")
+    if not stat.S_ISREG(st.st_mode):
+        # Directories and the like
+        raise Http404("File does not exist")
+
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), st.st_mtime):
+        return HttpResponseNotModified()
+
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), st.st_size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{st.st_size}'
+        return response
+
+    content_type = content_type or mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    f = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type, as_attachment=as_attachment, filename=filename)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(f, start, end - start + 1), status=206, content_type=content_type,
+            as_attachment=as_attachment, filename=filename or os.path.basename(full_path),
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = http_date(st.st_mtime)
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
+
+
+def accel_response(path, full_path, content_type=None, as_attachment=False, filename=None,
+                   cache_control=None):
+    """
+    Empty response telling the front proxy to send the file itself, or None
+    when MEDIA_ACCEL isn't configured.
+    """
+    backend = getattr(settings, 'MEDIA_ACCEL', None)
+    if not backend:
+        return None
+    if not os.path.isfile(full_path):
+        raise Http404("File does not exist")
+
+    response = HttpResponse(content_type=content_type or mimetypes.guess_type(full_path)[0] or '')
+    if backend == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = quote(prefix.rstrip('/') + '/' + path)
+    elif backend == 'x-sendfile':
+        response['X-Sendfile'] = full_path
+    else:
+        raise ValueError(f"Unknown MEDIA_ACCEL backend {backend!r}")
+
+    if as_attachment:
+        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename or os.path.basename(full_path))}"
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
+
+
+def send_file(request, path, **kwargs):
+    """Serve ``path`` under MEDIA_ROOT through the proxy if configured, else from Python"""
+    full_path = safe_join(settings.MEDIA_ROOT, path)
+    return accel_response(path, full_path, **kwargs) or file_response(request, full_path, **kwargs)
+
+
+def is_private(path):
+    """
+    Staff-only media: MEDIA_PRIVATE_PREFIXES paths, and blobs (and their
+    renditions) that no live row refers to.
+
+    Blob names carry no hint of what uses them, so a prefix can't cover them;
+    each is judged by the rows pointing at it. An inactive VisitorResource's
+    file, or a blob whose row has been deleted, is staff-only.
+    """
+    if path.startswith(tuple(getattr(settings, 'MEDIA_PRIVATE_PREFIXES', ()))):
+        return True
+    match = BLOB_PATH_RE.match(path)
+    return bool(match) and not is_published(match.group(1))
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded file; mounted at MEDIA_URL"""
+    path = posixpath.normpath(path).lstrip('/')
+    # Dotfiles (.htaccess, editor swap files, ...) are never served
+    if path.startswith('..') or any(part.startswith('.') for part in path.split('/')):
+        raise Http404("File does not exist")
+    private = is_private(path)
+    if private and not request.user.is_staff:
+        raise Http404("File does not exist")
+
+    if private:
+        # Staff-only: never kept by shared caches or the browser
+        cache_control = 'private, no-store'
+    elif path.startswith(IMMUTABLE_PREFIXES):
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+    try:
+        return send_file(request, path, cache_control=cache_control)
+    except SuspiciousFileOperation:
+        # safe_join refuses paths outside MEDIA_ROOT
+        raise Http404("File does not exist")
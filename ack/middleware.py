@@ -0,0 +1,110 @@
+import logging
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .log import request_id_var
+
+
+logger = logging.getLogger(__name__)
+
+
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestIDMiddleware:
+    """Tag each request (and its log records) with an id, reusing the proxy's if it sent one"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get('HTTP_X_REQUEST_ID', '')
+        if not _REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.id = request_id
+
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+
+        response['X-Request-ID'] = request_id
+        return response
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook that tallies query count and time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def get_query_budget(view_func, method=None):
+    """
+    Budget declared with ``@query_budget`` on a view function, APIView or ViewSet.
+
+    For a ViewSet, a budget on the action handling ``method`` (put there with
+    ``method_decorator``) wins over one on the class.
+    """
+    viewset = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(method.lower()) if method else None
+    handler = getattr(viewset, action, None) if action else None
+    for target in (handler, view_func, getattr(view_func, 'view_class', None), viewset):
+        budget = getattr(target, 'query_budget', None)
+        if budget is not None:
+            return budget
+    return getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the SQL queries and DB time each request costs.
+
+    In DEBUG the numbers go out as ``X-DB-Queries``/``X-DB-Time`` headers;
+    requests that go over their view's budget are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        request.query_budget = None
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        db_time_ms = round(counter.duration * 1000, 2)
+        if settings.DEBUG:
+            response['X-DB-Queries'] = str(counter.count)
+            response['X-DB-Time'] = f'{db_time_ms}ms'
+
+        budget = request.query_budget
+        if budget is not None and counter.count > budget:
+            logger.warning(
+                "Query budget exceeded on %s: %d queries (budget %d)",
+                request.path, counter.count, budget,
+                extra={'queries': counter.count, 'budget': budget, 'db_time_ms': db_time_ms},
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ack', '0019_event_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['-event_date', '-created_at', 'id'], name='gallery_keyset_idx'),
+        ),
+    ]
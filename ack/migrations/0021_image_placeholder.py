@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ack', '0020_gallery_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blurred preview shown while the image loads'),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blurred preview shown while the image loads'),
+        ),
+        migrations.AddField(
+            model_name='leader',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blurred preview shown while the image loads'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:29
+
+import ack.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ack', '0021_image_placeholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='churchservice',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='churchservice',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='leader',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='leader',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sermonevent',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sermonevent',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='churchservice',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='services/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', help_text='Event image', null=True, upload_to='events/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='gallery',
+            name='image',
+            field=ack.fields.SizedImageField(height_field='image_height', upload_to='gallery/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='leader',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='leaders/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='sermonevent',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='sermon_events/', width_field='image_width'),
+        ),
+    ]
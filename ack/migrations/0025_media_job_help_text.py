@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ack', '0024_event_cursor_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mediajob',
+            name='model',
+            field=models.CharField(help_text='app_label.ModelName of the row the upload belongs to', max_length=100),
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.urls import reverse
 from datetime import datetime, time
 
+from .fields import SizedImageField
+
 
 
 class Event(models.Model):
@@ -15,7 +17,10 @@ class Event(models.Model):
     ]
     
     title = models.CharField(max_length=200)
-    image = models.ImageField(upload_to='events/', blank=True, null=True, help_text="Event image")
+    image = SizedImageField(upload_to='events/', blank=True, null=True, help_text="Event image", width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview shown while the image loads")
     description = models.TextField()
     date = models.DateTimeField(default=timezone.now)
     time = models.TimeField(null=True, blank=True)
@@ -29,6 +34,10 @@ class Event(models.Model):
     class Meta:
         ordering = ['date']
         verbose_name_plural = 'Church Homepage Events update'
+        indexes = [
+            # Cursor pagination of the events APIs seeks on this
+            models.Index(fields=['date', 'id'], name='event_cursor_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -121,7 +130,10 @@ class Leader(models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=50, choices=POSITION_CHOICES)
     bio = models.TextField()
-    image = models.ImageField(upload_to='leaders/', blank=True, null=True)
+    image = SizedImageField(upload_to='leaders/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview shown while the image loads")
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     order = models.IntegerField(default=0, help_text="Order of display (lower numbers first)")
@@ -153,7 +165,10 @@ class Gallery(models.Model):
     ]
     
     title = models.CharField(max_length=200)
-    image = models.ImageField(upload_to='gallery/')
+    image = SizedImageField(upload_to='gallery/', width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview shown while the image loads")
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='EVENTS')
     description = models.TextField(blank=True, null=True)
     event_date = models.DateField(default=timezone.now, help_text="Date when the photo was taken")
@@ -164,6 +179,10 @@ class Gallery(models.Model):
     class Meta:
         ordering = ['-event_date', '-created_at']
         verbose_name_plural = 'Church Gallery'
+        indexes = [
+            # Keyset pagination on the gallery page seeks on this
+            models.Index(fields=['-event_date', '-created_at', 'id'], name='gallery_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -194,7 +213,9 @@ class ChurchService(models.Model):
     service_type = models.CharField(max_length=20, choices=SERVICE_TYPES)
     schedule = models.CharField(max_length=100, help_text="e.g., Sundays at 8:00 AM")
     description = models.TextField()
-    image = models.ImageField(upload_to='services/', blank=True, null=True)
+    image = SizedImageField(upload_to='services/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     image_url = models.URLField(blank=True, null=True, help_text="External image URL if not uploading")
     youtube_playlist_url = models.URLField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -264,7 +285,9 @@ class SermonEvent(models.Model):
     event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
     event_date = models.DateField()
     description = models.TextField()
-    image = models.ImageField(upload_to='sermon_events/', blank=True, null=True)
+    image = SizedImageField(upload_to='sermon_events/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     image_url = models.URLField(blank=True, null=True, help_text="External image URL if not uploading")
     youtube_url = models.URLField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -323,4 +346,42 @@ class CustomerReview(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Review from {self.name} - {self.subject}"
\ No newline at end of file
+        return f"Review from {self.name} - {self.subject}"
+
+class MediaJob(models.Model):
+    """
+    Processing queued by an upload: renditions and a placeholder for images,
+    page count and preview for documents.
+
+    Rows are written in the same transaction as the upload, so no work is lost
+    if the process dies; ``manage.py process_media_jobs`` works through them.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    model = models.CharField(max_length=100, help_text="app_label.ModelName of the row the upload belongs to")
+    object_id = models.CharField(max_length=64)
+    field_name = models.CharField(max_length=100)
+    file_name = models.CharField(max_length=255, help_text="The upload this job was queued for")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Media Job"
+        verbose_name_plural = "Media Jobs"
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} {self.field_name} ({self.status})"
@@ -0,0 +1,94 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import pagination
+
+
+class CountedPaginator(Paginator):
+    """Paginator for when the total has already been computed (e.g. in an aggregate)"""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_gallery_cursor(item):
+    """Opaque cursor pointing just after ``item`` in (-event_date, -created_at, id) order"""
+    position = [item.event_date.isoformat(), item.created_at.isoformat(), item.pk]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_gallery_cursor(cursor):
+    try:
+        event_date, created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        position = parse_date(event_date), parse_datetime(created_at), int(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+    if None in position:
+        raise InvalidCursor(cursor)
+    return position
+
+
+def gallery_keyset_page(queryset, cursor, page_size):
+    """
+    Return ``(items, next_cursor)`` for one page of gallery items.
+
+    Seeks straight to the cursor position using the gallery keyset index, so
+    every page costs the same no matter how deep into the gallery it is.
+    """
+    queryset = queryset.order_by('-event_date', '-created_at', 'id')
+    if cursor:
+        event_date, created_at, pk = decode_gallery_cursor(cursor)
+        queryset = queryset.filter(
+            Q(event_date__lt=event_date)
+            | Q(event_date=event_date, created_at__lt=created_at)
+            | Q(event_date=event_date, created_at=created_at, id__gt=pk)
+        )
+
+    # One extra row tells us whether there is a next page without a COUNT
+    items = list(queryset[:page_size + 1])
+    if len(items) > page_size:
+        items = items[:page_size]
+        return items, encode_gallery_cursor(items[-1])
+    return items, None
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    DRF cursor pagination sized from settings.
+
+    ``?page_size=`` may ask for fewer or more rows, up to API_MAX_PAGE_SIZE.
+    Subclasses set ``ordering`` to an indexed column with ``id`` as the
+    tie-breaker, so each page is an index range scan however deep it is.
+    """
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        # Read per request rather than at import, so settings overrides apply
+        self.page_size = getattr(settings, 'API_PAGE_SIZE', 20)
+        return super().get_page_size(request)
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+
+
+class EventCursorPagination(CursorPagination):
+    ordering = ('date', 'id')
+
+
+class ProgramCursorPagination(CursorPagination):
+    ordering = ('id',)
+
+
+class SubmissionCursorPagination(CursorPagination):
+    # Newest first, like the admin
+    ordering = ('-submission_date', '-id')
@@ -3,7 +3,56 @@ from .models import *
 from django.utils import timezone
 
 
-class SermonSerializer(serializers.ModelSerializer):
+def _param_set(request, name):
+    value = request.query_params.get(name) if request is not None else None
+    if value is None:
+        return None
+    return {field.strip() for field in value.split(',') if field.strip()}
+
+
+def is_requested(request, name, expandable=False):
+    """
+    Does this request want the field ``name``?
+
+    ``?fields=a,b`` limits a response to the listed fields. Expandable fields
+    (costly relations) are only included when named in ``?expand=`` or ``?fields=``.
+    """
+    fields = _param_set(request, 'fields')
+    if expandable:
+        return name in (_param_set(request, 'expand') or set()) | (fields or set())
+    return fields is None or name in fields or name in (_param_set(request, 'expand') or set())
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring ``?fields=`` and ``?expand=`` on reads.
+
+    Dropped fields are removed before serialization, so their
+    SerializerMethodFields never run and their relations are never loaded.
+    List ``Meta.expandable_fields`` to make fields opt-in. Only the top-level
+    serializer is trimmed; nested ones render in full.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD') or not self._is_top_level():
+            return fields
+
+        expandable = set(getattr(self.Meta, 'expandable_fields', ()))
+        for name in list(fields):
+            if not is_requested(request, name, expandable=name in expandable):
+                del fields[name]
+        return fields
+
+    def _is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+class SermonSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Custom fields for enhanced API response
     formatted_date = serializers.SerializerMethodField()
     is_recent = serializers.SerializerMethodField()
@@ -38,7 +87,7 @@ class SermonSerializer(serializers.ModelSerializer):
         return value
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Custom fields for better API response
     formatted_date = serializers.SerializerMethodField()
     formatted_event_type = serializers.SerializerMethodField()
@@ -76,7 +125,7 @@ class EventSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Event date cannot be in the past")
         return value
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     formatted_date = serializers.SerializerMethodField()
     formatted_event_type = serializers.SerializerMethodField()
     is_upcoming = serializers.SerializerMethodField()
@@ -0,0 +1,52 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .cache import bump_model_version
+from .documents import document_fields, documents_on_save, record_uploads
+from .images import image_fields, process_uploads, renditions_on_save
+from .storage import (
+    ContentAddressedStorage, file_fields, release_deleted_files, release_replaced_files,
+    remember_stored_files,
+)
+
+
+def _bump_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def track_model_changes(model):
+    """Bump the model's content version whenever a row is saved or deleted"""
+    uid = f'ack-content-version-{model._meta.label_lower}'
+    post_save.connect(_bump_version, sender=model, dispatch_uid=uid)
+    post_delete.connect(_bump_version, sender=model, dispatch_uid=uid)
+
+
+def connect_signals():
+    from .models import Event, Gallery, SermonEvent
+
+    # Home page fragments are keyed on these
+    track_model_changes(SermonEvent)
+    track_model_changes(Event)
+    # Gallery summary counts and categories
+    track_model_changes(Gallery)
+
+    # Responsive renditions for every uploaded image, in any app
+    for model in apps.get_models():
+        if image_fields(model):
+            uid = f'ack-renditions-{model._meta.label_lower}'
+            pre_save.connect(process_uploads, sender=model, dispatch_uid=uid)
+            post_save.connect(renditions_on_save, sender=model, dispatch_uid=uid)
+        # Size, page count and preview for documents
+        if document_fields(model):
+            uid = f'ack-documents-{model._meta.label_lower}'
+            pre_save.connect(record_uploads, sender=model, dispatch_uid=uid)
+            post_save.connect(documents_on_save, sender=model, dispatch_uid=uid)
+
+    # Reference counting for content-addressed blobs
+    if isinstance(default_storage, ContentAddressedStorage):
+        for model in {model for model, _ in file_fields()}:
+            uid = f'ack-blobs-{model._meta.label_lower}'
+            pre_save.connect(remember_stored_files, sender=model, dispatch_uid=uid)
+            post_save.connect(release_replaced_files, sender=model, dispatch_uid=uid)
+            post_delete.connect(release_deleted_files, sender=model, dispatch_uid=uid)
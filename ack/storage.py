@@ -0,0 +1,206 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored by the SHA-256 of their bytes under a fanned-out tree,
+``blobs/ab/cd/abcd....png``, so re-uploading the same photo reuses the file
+already on disk. A blob is deleted once no FileField/ImageField column in any
+model refers to it any more.
+
+A re-upload can pick up an existing blob before its row is committed, while
+another transaction is releasing the same blob. Reusing a blob therefore
+touches it, and blobs touched within BLOB_RELEASE_GRACE seconds are never
+deleted; whatever that leaves behind is swept up by collect_orphaned_media.
+"""
+import hashlib
+import logging
+import os
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import FileField, Q
+from django.utils.deconstruct import deconstructible
+
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIR = 'blobs'
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def blob_name(digest, ext):
+    return f'{BLOBS_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}'
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f'{BLOBS_DIR}/')
+
+
+def release_grace():
+    return getattr(settings, 'BLOB_RELEASE_GRACE', 10 * 60)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names uploads after their content.
+
+    Files saved under ``derived_prefixes`` (renditions, which are already named
+    after their blob) keep the name they were given.
+    """
+
+    derived_prefixes = ('renditions/',)
+
+    def _is_derived(self, name):
+        return name.startswith(self.derived_prefixes)
+
+    def get_available_name(self, name, max_length=None):
+        if self._is_derived(name):
+            return super().get_available_name(name, max_length)
+        # The real name comes from the content in _save(); nothing to de-clash here
+        return name
+
+    def _save(self, name, content):
+        if self._is_derived(name):
+            return super()._save(name, content)
+        name = blob_name(content_hash(content), os.path.splitext(name)[1])
+        if self._touch(name):
+            return name
+        # Written aside and moved into place, so a concurrent upload of the
+        # same bytes just replaces the blob with an identical file
+        temporary = super()._save(f'{name}.{uuid.uuid4().hex}.tmp', content)
+        os.replace(self.path(temporary), self.path(name))
+        return name
+
+    def _touch(self, name):
+        """Mark an existing blob as just reused; False if there is none"""
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def delete_unless_recent(self, name, seconds):
+        """
+        Delete a blob unless it was written or reused in the last ``seconds``.
+
+        The blob is moved aside before its age is checked: an upload reusing it
+        from then on finds it missing and writes it again, and one that touched
+        it just before makes it recent, so it is put back.
+        """
+        path = self.path(name)
+        released = f'{path}.{uuid.uuid4().hex}.released'
+        try:
+            os.rename(path, released)
+        except FileNotFoundError:
+            return True
+        if os.stat(released).st_mtime > time.time() - seconds:
+            # Identical bytes, so it doesn't matter if the blob was written again meanwhile
+            os.replace(released, path)
+            return False
+        os.remove(released)
+        return True
+
+
+def file_fields():
+    """Every (model, FileField) pair in the project, ImageFields included"""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.fields
+        if isinstance(field, FileField)
+    ]
+
+
+def rows_with_file(model, field):
+    """Rows of ``model`` whose ``field`` holds a file name"""
+    return model._default_manager.exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+
+
+def is_referenced(name):
+    """Does any row in any file column still point at ``name``?"""
+    return any(
+        model._default_manager.filter(**{field.attname: name}).exists()
+        for model, field in file_fields()
+    )
+
+
+def is_published(digest):
+    """
+    Does a live row point at the blob with this digest? Rows whose model has
+    ``is_active`` count only while it is set.
+    """
+    name = blob_name(digest, '')
+    for model, field in file_fields():
+        rows = model._default_manager.filter(
+            Q(**{field.attname: name}) | Q(**{f'{field.attname}__startswith': f'{name}.'})
+        )
+        if any(f.name == 'is_active' for f in model._meta.fields):
+            rows = rows.filter(is_active=True)
+        if rows.exists():
+            return True
+    return False
+
+
+def release_blob(name, storage=None):
+    """
+    Delete a blob, and its renditions, if nothing refers to it any more and
+    it wasn't stored or reused within the last BLOB_RELEASE_GRACE seconds
+    """
+    from .images import delete_renditions
+
+    storage = storage or default_storage
+    if not is_blob(name) or is_referenced(name):
+        return False
+    if isinstance(storage, ContentAddressedStorage):
+        if not storage.delete_unless_recent(name, release_grace()):
+            return False
+    else:
+        storage.delete(name)
+    delete_renditions(name, storage)
+    logger.info("Released blob %s", name)
+    return True
+
+
+def _file_attnames(model):
+    return [field.attname for field in model._meta.fields if isinstance(field, FileField)]
+
+
+def remember_stored_files(sender, instance, raw=False, **kwargs):
+    """pre_save: note the blobs the row pointed at before this save"""
+    if raw or instance.pk is None:
+        instance._stored_blobs = ()
+        return
+    attnames = _file_attnames(sender)
+    previous = sender._default_manager.filter(pk=instance.pk).values_list(*attnames).first() or ()
+    instance._stored_blobs = [name for name in previous if is_blob(name)]
+
+
+def release_replaced_files(sender, instance, **kwargs):
+    """post_save: release blobs this save stopped referring to"""
+    current = {getattr(instance, attname).name for attname in _file_attnames(sender)}
+    replaced = [name for name in getattr(instance, '_stored_blobs', ()) if name not in current]
+    instance._stored_blobs = ()
+    for name in replaced:
+        transaction.on_commit(lambda name=name: release_blob(name))
+
+
+def release_deleted_files(sender, instance, **kwargs):
+    """post_delete: release the row's blobs once the delete is committed"""
+    for attname in _file_attnames(sender):
+        name = getattr(instance, attname).name
+        if is_blob(name):
+            transaction.on_commit(lambda name=name: release_blob(name))
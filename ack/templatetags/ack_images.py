@@ -0,0 +1,44 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from ack import images
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def srcset(image):
+    """Usage: <img src="{{ item.image.url }}" srcset="{% srcset item.image %}" sizes="...">"""
+    return images.srcset(image)
+
+
+@register.simple_tag
+def picture(image, sizes='100vw', placeholder='', **attrs):
+    """
+    ``<picture>`` with AVIF/WebP sources in front of a srcset'd ``<img>``.
+
+    Usage: {% picture item.image sizes="(max-width: 768px) 100vw, 33vw" alt=item.title
+                      placeholder=item.image_placeholder loading="lazy" %}
+    ``placeholder`` (a data: URI) is painted as the image's background until it
+    loads. width/height come from the model's dimension fields. Extra keyword
+    arguments become attributes of the ``<img>``.
+    """
+    if not image:
+        return ''
+    img_attrs = {'src': image.url}
+    fallback = images.srcset(image)
+    if fallback:
+        img_attrs.update(srcset=fallback, sizes=sizes)
+    if placeholder:
+        img_attrs['style'] = f'background: url("{placeholder}") center / cover no-repeat'
+    # Intrinsic size lets the browser reserve the box before the image arrives
+    img_attrs['width'], img_attrs['height'] = images.stored_dimensions(image)
+    img_attrs.update(attrs)
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime, candidates, sizes) for mime, candidates in images.picture_sources(image)),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, flatatt(img_attrs))
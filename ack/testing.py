@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from .middleware import get_query_budget
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that fails when a URL runs more queries than its budget.
+
+    The budget defaults to the one declared on the view with ``@query_budget``.
+    """
+
+    def assertWithinQueryBudget(self, url, budget=None, method='get', **kwargs):
+        if budget is None:
+            budget = get_query_budget(resolve(url.split('?')[0]).func, method)
+            if budget is None:
+                self.fail(f"{url} has no @query_budget and no budget was given")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, **kwargs)
+
+        if len(queries) > budget:
+            executed = '\n'.join(
+                f"{i}. {query['sql']}" for i, query in enumerate(queries.captured_queries, start=1)
+            )
+            self.fail(f"{url} ran {len(queries)} queries, budget is {budget}:\n{executed}")
+        return response
+
+
+class TemporaryMediaMixin:
+    """TestCase mixin that stores uploads in a throwaway MEDIA_ROOT and starts with an empty cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
@@ -1,3 +1,868 @@
-from django.test import TestCase
+import base64
+import datetime
+import io
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from . import datagen, images, jobs, log, upcoming
+from .checks import check_shared_cache
+from .media import RangeNotSatisfiable, parse_range
+from .middleware import RequestIDMiddleware
+from .models import Event, Gallery, Leader, MediaJob, SermonEvent
+from .storage import release_blob
+from .testing import QueryBudgetMixin, TemporaryMediaMixin
+
+
+class PageQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        Event.objects.bulk_create([
+            Event(title=f'Event {i}', description='...', location='Church Hall',
+                  date=now + datetime.timedelta(days=i - 20))
+            for i in range(40)
+        ])
+        Gallery.objects.bulk_create([
+            Gallery(title=f'Photo {i}', image='gallery/photo.png',
+                    event_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i))
+            for i in range(30)
+        ])
+        Leader.objects.bulk_create([
+            Leader(name=f'Leader {i}', position='ELDER', bio='...') for i in range(10)
+        ])
+        SermonEvent.objects.create(
+            title='Easter', event_type='easter', event_date=datetime.date(2025, 4, 20), description='...'
+        )
+
+    def test_home(self):
+        self.assertWithinQueryBudget('/')
+
+    def test_about(self):
+        self.assertWithinQueryBudget('/about/')
+
+    def test_sermons(self):
+        self.assertWithinQueryBudget('/sermons/')
+
+    def test_events(self):
+        self.assertWithinQueryBudget('/events/')
+        self.assertWithinQueryBudget('/events/?type=PRAYER&past_page=2')
+
+    def test_gallery(self):
+        response = self.assertWithinQueryBudget('/gallery/')
+        self.assertWithinQueryBudget(f"/gallery/items/?cursor={response.context['next_cursor']}")
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        response = self.client.get('/events/')
+        self.assertIn('X-DB-Queries', response)
+        self.assertIn('X-DB-Time', response)
+
+
+@override_settings(EVENTS_PAST_PAGE_SIZE=4)
+class EventsPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # 3 upcoming and 10 past; every other one is a prayer meeting
+        Event.objects.bulk_create([
+            Event(title=f'Event {i}', description='...', location='Church Hall',
+                  event_type='PRAYER' if i % 2 else 'FELLOWSHIP',
+                  date=now + datetime.timedelta(days=i - 10))
+            for i in range(13)
+        ])
+
+    def titles(self, events):
+        return [event.title for event in events]
+
+    def test_counts(self):
+        response = self.client.get('/events/')
+        self.assertEqual(
+            [response.context[key] for key in ('upcoming_count', 'past_count', 'total_count')], [3, 10, 13],
+        )
+        self.assertEqual(self.titles(response.context['upcoming_events']), ['Event 12', 'Event 11', 'Event 10'])
+
+        response = self.client.get('/events/?type=PRAYER')
+        self.assertEqual([response.context[key] for key in ('upcoming_count', 'past_count')], [1, 5])
+        self.assertEqual(response.context['past_events'].paginator.num_pages, 2)
+
+    def test_past_pages(self):
+        page = self.client.get('/events/').context['past_events']
+        # Newest first
+        self.assertEqual(self.titles(page), ['Event 9', 'Event 8', 'Event 7', 'Event 6'])
+        self.assertEqual(page.paginator.num_pages, 3)
+        page = self.client.get('/events/?past_page=3').context['past_events']
+        self.assertEqual(self.titles(page), ['Event 1', 'Event 0'])
+
+    def test_bad_past_page(self):
+        # Out of range gives the last page, anything that isn't a number the first
+        for value, number in (('99', 3), ('0', 3), ('abc', 1), ('', 1), ('1.5', 1)):
+            with self.subTest(past_page=value):
+                response = self.client.get(f'/events/?past_page={value}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['past_events'].number, number)
+
+
+@override_settings(GALLERY_PAGE_SIZE=4)
+class GalleryPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Three dates, with every photo on a date uploaded at the same instant
+        Gallery.objects.bulk_create([
+            Gallery(title=f'Photo {i}', image='gallery/photo.png',
+                    event_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 3))
+            for i in range(11)
+        ])
+        Gallery.objects.update(created_at=datetime.datetime(2025, 2, 1, tzinfo=datetime.timezone.utc))
+        cls.ids = list(Gallery.objects.order_by('-event_date', 'id').values_list('id', flat=True))
+
+    def ids_on(self, response):
+        return [item.pk for item in response.context['gallery_items']]
+
+    def test_walk_with_ties(self):
+        response = self.client.get('/gallery/')
+        seen = self.ids_on(response)
+        cursor = response.context['next_cursor']
+        while cursor:
+            response = self.client.get(f'/gallery/items/?cursor={cursor}')
+            seen.extend(self.ids_on(response))
+            cursor = response.json()['next_cursor']
+        # Every photo exactly once, ties broken by id
+        self.assertEqual(seen, self.ids)
+
+    def test_malformed_cursor(self):
+        first_page = self.ids[:4]
+        valid = self.client.get('/gallery/').context['next_cursor']
+        for cursor in ('not-a-cursor', valid[:-3], 'WzEsIDJd', 'WyJ4IiwgIngiLCAieCJd'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f'/gallery/?cursor={cursor}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.ids_on(response), first_page)
+                response = self.client.get(f'/gallery/items/?cursor={cursor}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.ids_on(response), first_page)
+
+
+class ServeMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        os.makedirs(os.path.join(self.media_root, 'gallery'))
+        os.makedirs(os.path.join(self.media_root, 'private'))
+        for name in ('gallery/file.txt', 'private/file.txt'):
+            with open(os.path.join(self.media_root, name), 'wb') as f:
+                f.write(b'0123456789')
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_ACCEL=None,
+                                              MEDIA_PRIVATE_PREFIXES=['private/'])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_full(self):
+        response = self.client.get('/media/gallery/file.txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertTrue(response['Cache-Control'].startswith('public'))
+
+    def test_range(self):
+        response = self.client.get('/media/gallery/file.txt', HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+    def test_suffix_range(self):
+        response = self.client.get('/media/gallery/file.txt', HTTP_RANGE='bytes=-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+        self.assertEqual(response['Content-Range'], 'bytes 7-9/10')
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get('/media/gallery/file.txt', HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range('bytes=0-', 10), (0, 9))
+        self.assertEqual(parse_range('bytes=5-100', 10), (5, 9))
+        self.assertEqual(parse_range('bytes=-20', 10), (0, 9))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+        self.assertIsNone(parse_range(None, 10))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range('bytes=5-2', 10)
+
+    def test_directory(self):
+        self.assertEqual(self.client.get('/media/gallery/').status_code, 404)
+        self.assertEqual(self.client.get('/media/gallery').status_code, 404)
+
+    def test_private(self):
+        self.assertEqual(self.client.get('/media/private/file.txt').status_code, 404)
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        response = self.client.get('/media/private/file.txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-store')
+
+
+class GenerateDataTests(TestCase):
+    def test_runs_twice(self):
+        from ministries.models import MinistryMember
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root):
+            for seed in (0, 0, 1):
+                call_command('generate_data', scale=5, seed=seed, only=['members', 'gallery'], stdout=io.StringIO())
+        self.assertEqual(MinistryMember.objects.count(), 30)
+        self.assertEqual(MinistryMember.objects.values('email').distinct().count(), 30)
+        # The same placeholders every run, stored once
+        blobs = [name for _, _, names in os.walk(os.path.join(media_root, 'blobs')) for name in names]
+        self.assertEqual(len(blobs), len(datagen.PLACEHOLDER_COLOURS))
+
+
+@override_settings(API_PAGE_SIZE=3, API_MAX_PAGE_SIZE=5)
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Pairs of events at the same time, so ordering on date alone would tie
+        start = timezone.now()
+        Event.objects.bulk_create([
+            Event(title=f'Event {i}', description='...', location='Church Hall',
+                  date=start + datetime.timedelta(days=i // 2))
+            for i in range(8)
+        ])
+        cls.ids = list(Event.objects.order_by('date', 'id').values_list('id', flat=True))
+
+    def test_envelope(self):
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'next', 'previous', 'results'})
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('cursor=', response.data['next'])
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_page_size(self):
+        self.assertEqual(len(self.client.get('/api/events/?page_size=2').data['results']), 2)
+        # Capped at API_MAX_PAGE_SIZE, although there are more rows
+        self.assertEqual(len(self.client.get('/api/events/?page_size=50').data['results']), 5)
+
+    def test_walk(self):
+        seen, pages = [], []
+        url = '/api/events/'
+        while url:
+            response = self.client.get(url)
+            pages.append(url)
+            seen.extend(event['id'] for event in response.data['results'])
+            url = response.data['next']
+        # Every row exactly once, ties broken by id
+        self.assertEqual(seen, self.ids)
+        self.assertEqual(len(pages), 3)
+
+        # And back again from the last page
+        back = self.client.get(self.client.get(pages[-1]).data['previous'])
+        self.assertEqual([event['id'] for event in back.data['results']], self.ids[3:6])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/events/?cursor=not-a-cursor').status_code, 404)
+
+
+DATABASE_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'ack_test_cache'}}
+
+
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.leader = Leader.objects.create(name='Original Name', position='ELDER', bio='...')
+
+    def rename_quietly(self, name):
+        # update() sends no post_save, so the content version stays put
+        Leader.objects.filter(pk=self.leader.pk).update(name=name)
+
+    def test_per_process_cache_not_used(self):
+        self.assertContains(self.client.get('/about/'), 'Original Name')
+        self.rename_quietly('Quiet Rename')
+        self.assertContains(self.client.get('/about/'), 'Quiet Rename')
+
+    @override_settings(DEBUG=False)
+    def test_per_process_cache_check(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['ack.W001'])
+        with override_settings(CACHES=DATABASE_CACHE):
+            self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_save_purges_page(self):
+        call_command('createcachetable', verbosity=0)
+        self.assertContains(self.client.get('/about/'), 'Original Name')
+
+        # Hit: the cached page doesn't see a change no signal announced
+        self.rename_quietly('Quiet Rename')
+        self.assertContains(self.client.get('/about/'), 'Original Name')
+
+        # Miss: post_save bumps Leader's version
+        self.leader.name = 'Saved Name'
+        self.leader.save()
+        self.assertContains(self.client.get('/about/'), 'Saved Name')
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_static_pages(self):
+        call_command('createcachetable', verbosity=0)
+        for url in ('/giving/', '/ministries/'):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_not_modified(self):
+        call_command('createcachetable', verbosity=0)
+        for url, template in (('/', 'ack/home.html'), ('/sermons/', 'ack/sermons.html'),
+                              ('/ministries/mu/', 'ministries/mu.html')):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with self.assertTemplateNotUsed(template):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_home_etag_follows_events(self):
+        call_command('createcachetable', verbosity=0)
+        etag = self.client.get('/')['ETag']
+        # Sermons aren't on the home page
+        SermonEvent.objects.create(title='Easter', event_type='easter',
+                                   event_date=datetime.date(2025, 4, 20), description='...')
+        self.assertEqual(self.client.get('/')['ETag'], etag)
+
+        Event.objects.create(title='Prayer', description='...', location='Church Hall',
+                             date=timezone.now() + datetime.timedelta(days=1))
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class LoggingTests(SimpleTestCase):
+    def record(self, level=logging.INFO, **attrs):
+        return logging.makeLogRecord({'levelno': level, 'msg': 'message', **attrs})
+
+    def test_sampling_per_request(self):
+        sampling = log.SamplingFilter(rate=0.5)
+        kept = {request_id: sampling.filter(self.record(request_id=request_id))
+                for request_id in (f'request-{i}' for i in range(200))}
+        self.assertTrue(60 < sum(kept.values()) < 140)
+        # Every record of a request gets the same answer
+        for request_id, decision in kept.items():
+            self.assertEqual(sampling.filter(self.record(request_id=request_id)), decision)
+        # Warnings always pass
+        self.assertTrue(all(sampling.filter(self.record(logging.WARNING, request_id=request_id))
+                            for request_id in kept))
+        self.assertTrue(log.SamplingFilter(rate=1).filter(self.record(request_id='request-0')))
+        self.assertFalse(any(log.SamplingFilter(rate=0).filter(self.record(request_id=request_id))
+                             for request_id in kept))
+
+    def test_sampling_outside_requests(self):
+        sampling = log.SamplingFilter(rate=0.5)
+        kept = sum(sampling.filter(self.record(request_id='-')) for _ in range(400))
+        # Decided record by record, not all or nothing
+        self.assertTrue(100 < kept < 300)
+
+    def handler(self, **kwargs):
+        stream = io.StringIO()
+        handler = log.BatchingHandler(stream=stream, **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler, stream
+
+    def test_batch_size(self):
+        handler, stream = self.handler(batch_size=3, flush_interval=60)
+        for i in range(3):
+            handler.emit(self.record(msg=f'line {i}'))
+        deadline = time.monotonic() + 5
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # A full batch goes out without waiting for the interval
+        self.assertEqual(stream.getvalue(), 'line 0\nline 1\nline 2\n')
+
+    def test_close_flushes(self):
+        handler, stream = self.handler(batch_size=50, flush_interval=60)
+        handler.emit(self.record(msg='last words'))
+        handler.close()
+        self.assertEqual(stream.getvalue(), 'last words\n')
+
+    def test_request_id(self):
+        seen = []
+
+        def view(request):
+            record = self.record()
+            log.RequestIDFilter().filter(record)
+            seen.append((request.id, record.request_id))
+            return HttpResponse()
+
+        middleware = RequestIDMiddleware(view)
+        response = middleware(RequestFactory().get('/'))
+        request_id, record_id = seen[-1]
+        self.assertEqual(response['X-Request-ID'], request_id)
+        self.assertEqual(record_id, request_id)
+        self.assertRegex(request_id, r'^[0-9a-f]{32}$')
+
+        # The proxy's id is kept when it looks like one
+        response = middleware(RequestFactory().get('/', HTTP_X_REQUEST_ID='edge-1234'))
+        self.assertEqual(response['X-Request-ID'], 'edge-1234')
+        self.assertEqual(seen[-1], ('edge-1234', 'edge-1234'))
+        response = middleware(RequestFactory().get('/', HTTP_X_REQUEST_ID='bad id\n'))
+        self.assertNotEqual(response['X-Request-ID'], 'bad id\n')
+
+        # Outside the request, records are untagged again
+        record = self.record()
+        log.RequestIDFilter().filter(record)
+        self.assertEqual(record.request_id, '-')
+
+
+@override_settings(UPCOMING_EVENTS_BUCKET=60)
+class UpcomingEventsTests(TestCase):
+    now = datetime.datetime(2026, 3, 1, 9, 30, 45, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        cache.clear()
+        clock = mock.patch('ack.upcoming.timezone.now', return_value=self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def create(self, title, seconds):
+        return Event.objects.create(title=title, description='...', location='Church Hall',
+                                    date=self.now + datetime.timedelta(seconds=seconds))
+
+    def test_cutoff(self):
+        self.assertEqual(upcoming.upcoming_cutoff(), datetime.datetime(2026, 3, 1, 9, 30, tzinfo=datetime.timezone.utc))
+        self.assertEqual(upcoming.upcoming_cutoff(self.now.replace(second=0)), self.now.replace(second=0))
+
+    def test_bucket(self):
+        self.create('Last bucket', -46)
+        self.create('This bucket', -45)
+        self.create('Tomorrow', 86400)
+        # Everything starting since the bucket began still counts as upcoming
+        self.assertEqual([event.title for event in upcoming.get_upcoming_events(5)], ['This bucket', 'Tomorrow'])
+
+    def test_api_queryset(self):
+        self.create('Last bucket', -46)
+        self.create('This bucket', -45)
+        response = self.client.get('/api/events/upcoming/')
+        self.assertEqual([event['title'] for event in response.data['results']], ['This bucket'])
+
+    def test_list_survives_cache_flush(self):
+        def quietly_add(days):
+            # bulk_create sends no signals, so Event's version isn't bumped
+            Event.objects.bulk_create([Event(title='Event', description='...', location='Church Hall',
+                                             date=self.now + datetime.timedelta(days=days))])
+
+        quietly_add(1)
+        self.assertEqual(len(upcoming.get_upcoming_events(5)), 1)
+        quietly_add(7)
+        # A flush loses Event's version; the next one must not repeat it
+        cache.clear()
+        self.assertEqual(len(upcoming.get_upcoming_events(5)), 2)
+
+
+def image_bytes(size=(800, 600), fmt='JPEG', colour='#8b1538', mode='RGB', exif_orientation=None):
+    image = Image.new(mode, size, colour)
+    buffer = io.BytesIO()
+    options = {}
+    if exif_orientation:
+        exif = Image.Exif()
+        exif[0x0112] = exif_orientation
+        options['exif'] = exif
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def noise(width, height):
+    """Photo-like content: compresses far better as JPEG than as PNG"""
+    rng = random.Random(0)
+    return Image.frombytes('RGB', (width, height), bytes(rng.randrange(256) for _ in range(width * height * 3)))
+
+
+class MediaTestCase(TemporaryMediaMixin, TestCase):
+    def upload(self, name='photo.jpg', **kwargs):
+        return Gallery.objects.create(title='Photo', image=SimpleUploadedFile(name, image_bytes(**kwargs)))
+
+
+class MediaJobTests(MediaTestCase):
+    def test_run_job(self):
+        photo = self.upload()
+        job = MediaJob.objects.get()
+        self.assertEqual((job.model, job.object_id, job.file_name), ('ack.Gallery', str(photo.pk), photo.image.name))
+        self.assertEqual(job.status, MediaJob.PENDING)
+
+        self.assertEqual(jobs.claim_jobs(10), [job.pk])
+        self.assertEqual(jobs.claim_jobs(10), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (MediaJob.RUNNING, 1))
+
+        self.assertEqual(jobs.run_job(job.pk), MediaJob.DONE)
+        job.refresh_from_db()
+        self.assertEqual(job.status, MediaJob.DONE)
+        photo.refresh_from_db()
+        self.assertTrue(images.is_rendered(photo.image))
+        self.assertTrue(photo.image_placeholder.startswith('data:image/'))
+
+    def test_failed_job(self):
+        photo = self.upload()
+        photo.image.storage.delete(photo.image.name)
+        job = MediaJob.objects.get()
+
+        with self.assertLogs('ack.jobs', 'ERROR'):
+            jobs.claim_jobs(10)
+            self.assertEqual(jobs.run_job(job.pk, max_attempts=2), MediaJob.PENDING)
+            jobs.claim_jobs(10)
+            self.assertEqual(jobs.run_job(job.pk, max_attempts=2), MediaJob.FAILED)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (MediaJob.FAILED, 2))
+        self.assertIn('FileNotFoundError', job.last_error)
+
+    def test_backfill_commands_queue_jobs(self):
+        def queued(command, *args):
+            before = MediaJob.objects.filter(status=MediaJob.PENDING).count()
+            call_command(command, *args, stdout=io.StringIO())
+            return MediaJob.objects.filter(status=MediaJob.PENDING).count() - before
+
+        photo = self.upload()
+        # The upload's own job is still pending
+        self.assertEqual(queued('generate_placeholders'), 0)
+        self.assertEqual(queued('generate_renditions'), 0)
+        for pk in jobs.claim_jobs(10):
+            jobs.run_job(pk)
+
+        self.assertEqual(queued('generate_renditions'), 0)
+        self.assertEqual(queued('generate_placeholders'), 0)
+        Gallery.objects.filter(pk=photo.pk).update(image_placeholder='')
+        self.assertEqual(queued('generate_placeholders'), 1)
+        # Queued already
+        self.assertEqual(queued('generate_renditions', '--force'), 0)
+        self.assertFalse(images.is_rendered(photo.image))
+
+
+class BlobStorageTests(MediaTestCase):
+    def age(self, name, seconds=3600):
+        path = default_storage.path(name)
+        os.utime(path, (time.time() - seconds,) * 2)
+
+    def test_dedup(self):
+        first = self.upload('one.jpg')
+        second = self.upload('two.jpg')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.startswith('blobs/'))
+        self.assertEqual(
+            os.listdir(os.path.dirname(default_storage.path(first.image.name))),
+            [os.path.basename(first.image.name)],
+        )
+
+    def test_release_keeps_referenced_blob(self):
+        first = self.upload('one.jpg')
+        second = self.upload('two.jpg')
+        self.age(first.image.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(default_storage.exists(second.image.name))
+
+    def test_release_deletes_unreferenced_blob(self):
+        photo = self.upload()
+        name = photo.image.name
+        self.age(name)
+        with self.assertLogs('ack.storage', 'INFO'), self.captureOnCommitCallbacks(execute=True):
+            photo.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_release_keeps_recently_reused_blob(self):
+        photo = self.upload()
+        name = photo.image.name
+        self.age(name)
+        # A new upload of the same bytes whose row isn't committed yet
+        with default_storage.open(name) as f:
+            self.assertEqual(default_storage.save('again.jpg', ContentFile(f.read())), name)
+        photo.delete()
+        self.assertFalse(release_blob(name))
+        self.assertTrue(default_storage.exists(name))
+
+    def test_serve_referenced_blobs_only(self):
+        photo = self.upload()
+        response = self.client.get(photo.image.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+        # Stored, but no row refers to it
+        orphan = default_storage.save('orphan.png', ContentFile(image_bytes(fmt='PNG')))
+        self.assertTrue(orphan.startswith('blobs/'))
+        self.assertEqual(self.client.get(default_storage.url(orphan)).status_code, 404)
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        response = self.client.get(default_storage.url(orphan))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-store')
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[320, 640, 1024], IMAGE_MODERN_FORMATS=[])
+class RenditionTests(MediaTestCase):
+    def render(self, template, **context):
+        return Template('{% load ack_images %}' + template).render(Context(context))
+
+    def test_manifest(self):
+        photo = self.upload(size=(800, 600))
+        manifest = images.generate_renditions(photo.image)
+        self.assertEqual(manifest['width'], 800)
+        # 1024 is wider than the original, which covers it
+        self.assertEqual([width for width, _ in manifest['renditions']], [320, 640])
+        for width, name in manifest['renditions']:
+            self.assertEqual(name, images.rendition_name(photo.image.name, width, 'jpg'))
+            with default_storage.open(name) as f:
+                self.assertEqual(Image.open(f).size, (width, width * 3 // 4))
+
+        # Probed from storage again once the cache is gone
+        cache.clear()
+        self.assertEqual(images.image_manifest(photo.image.name, default_storage), manifest)
+        self.assertTrue(images.is_rendered(photo.image))
+
+    def test_transparent_renditions_stay_png(self):
+        photo = self.upload('logo.png', fmt='PNG', mode='RGBA', colour=(0, 0, 0, 0))
+        manifest = images.generate_renditions(photo.image)
+        self.assertTrue(manifest['renditions'])
+        self.assertTrue(all(name.endswith('.png') for _, name in manifest['renditions']))
+
+    def test_srcset_tag(self):
+        photo = self.upload(size=(800, 600))
+        self.assertEqual(self.render('{% srcset photo.image %}', photo=photo), '')
+
+        manifest = images.generate_renditions(photo.image)
+        candidates = manifest['renditions'] + [(800, photo.image.name)]
+        self.assertEqual(
+            self.render('{% srcset photo.image %}', photo=photo),
+            ', '.join(f'/media/{name} {width}w' for width, name in candidates),
+        )
+        self.assertEqual(self.render('{% srcset photo.image %}', photo=Gallery()), '')
+
+    def test_delete_renditions(self):
+        photo = self.upload(size=(800, 600))
+        manifest = images.generate_renditions(photo.image)
+        images.delete_renditions(photo.image.name, default_storage)
+        self.assertFalse(any(default_storage.exists(name) for _, name in manifest['renditions']))
+        self.assertFalse(images.is_rendered(photo.image))
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[320, 640], IMAGE_MODERN_FORMATS=['webp'])
+class PictureTests(MediaTestCase):
+    def test_modern_formats(self):
+        self.assertEqual([fmt for fmt, _, _ in images.modern_formats()], ['WEBP'])
+        with override_settings(IMAGE_MODERN_FORMATS=[]):
+            self.assertEqual(images.modern_formats(), [])
+
+    def test_webp_sources(self):
+        photo = self.upload(size=(800, 600))
+        manifest = images.generate_renditions(photo.image)
+        mime, candidates = manifest['sources'][0]
+        self.assertEqual(mime, 'image/webp')
+        # Modern formats also replace the original at full width
+        self.assertEqual([width for width, _ in candidates], [320, 640, 800])
+        for width, name in candidates:
+            self.assertTrue(name.endswith(f'.{width}w.webp'))
+            with default_storage.open(name) as f:
+                self.assertEqual(Image.open(f).format, 'WEBP')
+
+    def test_picture_tag(self):
+        photo = self.upload(size=(800, 600))
+        manifest = images.generate_renditions(photo.image)
+        rendered = Template(
+            '{% load ack_images %}{% picture photo.image sizes="50vw" alt=photo.title loading="lazy" %}'
+        ).render(Context({'photo': photo}))
+
+        def srcset(candidates):
+            return ', '.join(f'/media/{name} {width}w' for width, name in candidates)
+
+        self.assertHTMLEqual(rendered, (
+            '<picture>'
+            f'<source type="image/webp" srcset="{srcset(manifest["sources"][0][1])}" sizes="50vw">'
+            f'<img src="{photo.image.url}" srcset="{srcset(manifest["renditions"] + [(800, photo.image.name)])}" '
+            'sizes="50vw" width="800" height="600" alt="Photo" loading="lazy">'
+            '</picture>'
+        ))
+
+    def test_picture_without_renditions(self):
+        photo = self.upload(size=(800, 600))
+        rendered = Template('{% load ack_images %}{% picture photo.image alt="" %}').render(Context({'photo': photo}))
+        self.assertHTMLEqual(
+            rendered, f'<picture><img src="{photo.image.url}" width="800" height="600" alt=""></picture>',
+        )
+        self.assertEqual(Template('{% load ack_images %}{% picture image %}').render(Context({'image': None})), '')
+
+
+@override_settings(IMAGE_UPLOAD_MAX_DIMENSION=600)
+class NormaliseUploadTests(MediaTestCase):
+    def stored(self, photo):
+        with default_storage.open(photo.image.name) as f:
+            image = Image.open(f)
+            image.load()
+        return image
+
+    def test_rotated_and_downscaled(self):
+        # Orientation 6: stored landscape, shown rotated 90° clockwise
+        photo = self.upload(size=(1200, 800), exif_orientation=6)
+        image = self.stored(photo)
+        self.assertEqual(image.size, (400, 600))
+        self.assertEqual((photo.image_width, photo.image_height), (400, 600))
+        self.assertEqual(len(image.getexif()), 0)
+
+    def test_clean_upload_kept(self):
+        # Web-sized, no metadata and smaller than a re-encode would be
+        buffer = io.BytesIO()
+        noise(300, 200).save(buffer, 'JPEG', quality=50)
+        original = buffer.getvalue()
+        photo = Gallery.objects.create(title='Photo', image=SimpleUploadedFile('photo.jpg', original))
+        with default_storage.open(photo.image.name) as f:
+            self.assertEqual(f.read(), original)
+
+    def test_png_screenshot_stays_png(self):
+        photo = self.upload('screenshot.png', size=(1200, 800), fmt='PNG')
+        self.assertTrue(photo.image.name.endswith('.png'))
+        self.assertEqual(self.stored(photo).size, (600, 400))
+
+    def test_png_photo_becomes_jpeg(self):
+        buffer = io.BytesIO()
+        noise(400, 300).save(buffer, 'PNG')
+        photo = Gallery.objects.create(title='Photo', image=SimpleUploadedFile('photo.png', buffer.getvalue()))
+        self.assertTrue(photo.image.name.endswith('.jpg'))
+        self.assertEqual(self.stored(photo).format, 'JPEG')
+
+    def test_unreadable_upload_stored_as_is(self):
+        with self.assertLogs('ack.images', 'ERROR'):
+            photo = Gallery.objects.create(title='Photo', image=SimpleUploadedFile('photo.jpg', b'not an image'))
+        with default_storage.open(photo.image.name) as f:
+            self.assertEqual(f.read(), b'not an image')
+
+
+class PlaceholderTests(MediaTestCase):
+    def decode(self, placeholder):
+        header, data = placeholder.split(',', 1)
+        self.assertTrue(header.startswith('data:image/') and header.endswith(';base64'))
+        return Image.open(io.BytesIO(base64.b64decode(data)))
+
+    @override_settings(IMAGE_PLACEHOLDER_WIDTH=16)
+    def test_make_placeholder(self):
+        photo = self.upload(size=(800, 600))
+        placeholder = images.make_placeholder(photo.image)
+        self.assertLess(len(placeholder), 1000)
+        self.assertEqual(self.decode(placeholder).size, (16, 12))
+
+    def test_update_placeholder(self):
+        photo = self.upload()
+        self.assertEqual(photo.image_placeholder, '')
+        images.update_placeholder(Gallery, photo.pk, 'image')
+        photo.refresh_from_db()
+        self.decode(photo.image_placeholder)
+
+        # A new upload clears it until the worker has been through again
+        photo.image = SimpleUploadedFile('other.jpg', image_bytes(colour='#1f4e79'))
+        photo.save()
+        photo.refresh_from_db()
+        self.assertEqual(photo.image_placeholder, '')
+
+    def test_replaced_image_keeps_its_own_placeholder(self):
+        photo = self.upload()
+        stale_name = photo.image.name
+        photo.image = SimpleUploadedFile('other.jpg', image_bytes(colour='#1f4e79'))
+        photo.save()
+        # A job for the old image doesn't touch the row now pointing elsewhere
+        self.assertFalse(jobs.process_image(Gallery, photo.pk, 'image', stale_name))
+        photo.refresh_from_db()
+        self.assertEqual(photo.image_placeholder, '')
+
+
+class SizedImageFieldTests(MediaTestCase):
+    def test_dimensions_from_upload(self):
+        photo = self.upload(size=(640, 480))
+        self.assertEqual((photo.image_width, photo.image_height), (640, 480))
+        photo.refresh_from_db()
+        self.assertEqual((photo.image_width, photo.image_height), (640, 480))
+
+    def test_stored_files_never_opened(self):
+        photo = Gallery.objects.create(title='Photo', image='gallery/missing.jpg')
+        # Django's ImageField would open the (missing) file to fill these in
+        loaded = Gallery.objects.get(pk=photo.pk)
+        self.assertEqual((loaded.image_width, loaded.image_height), (None, None))
+        loaded.title = 'Renamed'
+        loaded.save()
+        self.assertEqual(images.stored_dimensions(loaded.image), (None, None))
+
+    def test_backfill(self):
+        photo = self.upload(size=(640, 480))
+        Gallery.objects.filter(pk=photo.pk).update(image_width=None, image_height=None)
+        Gallery.objects.create(title='Gone', image='gallery/missing.jpg')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('backfill_image_dimensions', stdout=stdout, stderr=stderr)
+        photo.refresh_from_db()
+        self.assertEqual((photo.image_width, photo.image_height), (640, 480))
+        self.assertIn('ack.Gallery.image: 1 rows updated, 1 unreadable', stdout.getvalue())
+        self.assertIn('gallery/missing.jpg', stderr.getvalue())
+
+
+@override_settings(IMAGE_RENDITION_WIDTHS=[320], IMAGE_MODERN_FORMATS=[])
+class CollectOrphanedMediaTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.photo = self.upload(size=(800, 600))
+        self.renditions = [name for _, name in images.generate_renditions(self.photo.image)['renditions']]
+        self.orphan = default_storage.save('orphan.png', ContentFile(image_bytes(fmt='PNG')))
+
+    def age(self, *names, hours=48):
+        for name in names:
+            os.utime(default_storage.path(name), (time.time() - hours * 3600,) * 2)
+
+    def collect(self, *args):
+        stdout = io.StringIO()
+        call_command('collect_orphaned_media', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_report(self):
+        self.age(self.photo.image.name, *self.renditions, self.orphan)
+        output = self.collect()
+        self.assertIn(self.orphan, output)
+        self.assertIn('3 files scanned, 1 orphaned', output)
+        # Only listed
+        self.assertTrue(default_storage.exists(self.orphan))
+
+    def test_quarantine(self):
+        self.age(self.photo.image.name, *self.renditions, self.orphan)
+        output = self.collect('--quarantine')
+        self.assertIn('moved to .quarantine/', output)
+        self.assertFalse(default_storage.exists(self.orphan))
+        # Its fan-out directories went with it
+        self.assertFalse(os.path.exists(os.path.dirname(default_storage.path(self.orphan))))
+        quarantined = [os.path.join(path, name) for path, _, names in os.walk(default_storage.path('.quarantine'))
+                       for name in names]
+        self.assertEqual([os.path.basename(path) for path in quarantined], [os.path.basename(self.orphan)])
+        for name in [self.photo.image.name, *self.renditions]:
+            self.assertTrue(default_storage.exists(name))
+
+        # Quarantined files aren't scanned again
+        self.assertIn('2 files scanned, 0 orphaned', self.collect('--quarantine'))
+
+    def test_min_age(self):
+        # Too new by default: its row may not be committed yet
+        self.assertIn('0 orphaned', self.collect())
+        self.assertIn('1 orphaned', self.collect('--min-age', '0'))
+        self.age(self.orphan, hours=3)
+        self.assertIn('0 orphaned', self.collect('--min-age', '4'))
+        self.assertIn('1 orphaned', self.collect('--min-age', '2'))
+
+    def test_renditions_follow_their_original(self):
+        self.age(self.photo.image.name, *self.renditions, self.orphan)
+        # The row stops pointing at the photo without a signal to release it
+        Gallery.objects.filter(pk=self.photo.pk).update(image='')
+        output = self.collect('--quiet')
+        self.assertIn('3 files scanned, 3 orphaned', output)
+        self.assertNotIn(self.orphan, output)
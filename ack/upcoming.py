@@ -0,0 +1,58 @@
+"""
+The shared "upcoming events" query.
+
+"Upcoming" is measured against the clock rounded down to
+UPCOMING_EVENTS_BUCKET seconds rather than the exact time, so every request
+in the same bucket asks the same question. Short lists (the home page, the
+API summary) are kept in process memory for the rest of their bucket; the
+key includes Event's content version, so admin edits show at once. Versions
+never repeat, even across a cache flush (see ack.cache).
+"""
+import datetime
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+from .cache import content_version
+from .models import Event
+
+
+_lock = threading.Lock()
+_lists = {}
+
+
+def bucket_seconds():
+    return getattr(settings, 'UPCOMING_EVENTS_BUCKET', 60)
+
+
+def upcoming_cutoff(now=None):
+    """The current time rounded down to the start of its bucket"""
+    now = now or timezone.now()
+    timestamp = now.timestamp()
+    return datetime.datetime.fromtimestamp(timestamp - timestamp % bucket_seconds(), tz=datetime.timezone.utc)
+
+
+def bucket_key(request):
+    """``conditional_page`` key for pages that list upcoming events"""
+    return upcoming_cutoff().isoformat()
+
+
+def upcoming_events_queryset():
+    """Events starting in the current bucket or later, in model order"""
+    return Event.objects.filter(date__gte=upcoming_cutoff())
+
+
+def get_upcoming_events(limit):
+    """The next ``limit`` upcoming events, computed at most once per bucket per process"""
+    cutoff = upcoming_cutoff()
+    key = (cutoff, content_version(Event), limit)
+    events = _lists.get(key)
+    if events is None:
+        events = list(upcoming_events_queryset()[:limit])
+        with _lock:
+            # Earlier buckets and versions will never be asked for again
+            for stale in [stale for stale in _lists if stale[:2] != key[:2]]:
+                del _lists[stale]
+            _lists[key] = events
+    return events
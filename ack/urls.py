@@ -10,6 +10,7 @@ urlpatterns = [
     path('sermons/', views.sermons, name='sermons'),
     path('events/', views.events, name='events'),
     path('gallery/', views.gallery, name='gallery'),
+    path('gallery/items/', views.gallery_items, name='gallery_items'),
     path('giving/', views.giving, name='giving'),
     path('calendar/', views.full_calendar, name='full_calendar'),
     path('ministries/', views.ministries, name='ministries'),
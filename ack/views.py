@@ -1,5 +1,12 @@
+from functools import partial
+
 from django.shortcuts import render, redirect
-from django.utils import timezone
+from django.conf import settings
+from django.db.models import Count, Q
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from urllib.parse import urlencode
 from rest_framework import generics
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -7,19 +14,33 @@ from .models import *
 from .serializers import *
 from django.contrib import messages
 from .forms import ReviewForm
+from .cache import content_version, home_fragment_timeout, is_shared_cache
+from .decorators import cached_page, conditional_page, query_budget
+from .pagination import CountedPaginator, EventCursorPagination, InvalidCursor, gallery_keyset_page
+from .upcoming import bucket_key, get_upcoming_events, upcoming_cutoff, upcoming_events_queryset
+
+
+def _upcoming_events(request):
+    return upcoming_events_queryset()
 
 
 # Traditional Django Views - Updated for better integration
+@query_budget(3)
+@conditional_page(Event, key=bucket_key)
 def home(request):
-    recent_sermons = SermonEvent.objects.all()[:3]  # Uses model ordering
-    upcoming_events = Event.objects.filter(date__gte=timezone.now())[:3]  # Uses model ordering
+    # Called by the template only when the fragment has to be rendered
+    upcoming_events = partial(get_upcoming_events, 3)
     
     context = {
-        'recent_sermons': recent_sermons,
         'upcoming_events': upcoming_events,
+        'content_version': content_version(Event),
+        'fragment_timeout': home_fragment_timeout(),
     }
     return render(request, 'ack/home.html', context)
 
+@query_budget(2)
+@conditional_page(Leader.objects.filter(is_active=True))
+@cached_page(Leader)
 def about(request):
     leaders = Leader.objects.filter(is_active=True).order_by('order', 'position')
     
@@ -28,7 +49,8 @@ def about(request):
     }
     return render(request, 'ack/about.html', context)
 
-
+@query_budget(2)
+@conditional_page(ChurchService, SermonEvent)
 def sermons(request):
     """Sermons page with services and past events"""
     # Get active church services
@@ -73,79 +95,123 @@ def submit_review(request):
 
 
 
+@query_budget(5)
+@conditional_page(Event.objects.all(), _upcoming_events)
 def events(request):
     # Get filter parameter from request
     event_type = request.GET.get('type', 'all')
     
-    # Debug: Print the filter being received
-    print(f"DEBUG: Event type filter requested: '{event_type}'")
-    
-    # Get ALL events ordered by date
-    all_events = Event.objects.all().order_by('-date')
-    
-    # Filter events by type if specified
+    events = Event.objects.all()
     if event_type != 'all':
         # Use exact match for event_type (case-sensitive)
-        all_events = all_events.filter(event_type=event_type)
-        print(f"DEBUG: After filtering by '{event_type}', found {all_events.count()} events")
+        events = events.filter(event_type=event_type)
+    
+    # Split upcoming/past and count both sides in a single query
+    # (same clock as the ETag's upcoming source)
+    now = upcoming_cutoff()
+    is_upcoming = Q(date__gte=now)
+    counts = events.aggregate(
+        upcoming=Count('id', filter=is_upcoming),
+        past=Count('id', filter=~is_upcoming),
+    )
     
-    # Separate upcoming and past events - handle DateTimeField properly
-    now = timezone.now()
-    upcoming_events = [event for event in all_events if event.date >= now]
-    past_events = [event for event in all_events if event.date < now]
+    upcoming_events = events.filter(is_upcoming).order_by('-date')
+    past_events = events.filter(~is_upcoming).order_by('-date')
     
-    # Debug: Print final counts
-    print(f"DEBUG: Final counts - All: {len(all_events)}, Upcoming: {len(upcoming_events)}, Past: {len(past_events)}")
+    # Past events grow forever, so only one page of them is loaded
+    paginator = CountedPaginator(
+        past_events,
+        getattr(settings, 'EVENTS_PAST_PAGE_SIZE', 12),
+        count=counts['past'],
+    )
+    past_page = paginator.get_page(request.GET.get('past_page'))
     
     context = {
-        'all_events': all_events,
         'upcoming_events': upcoming_events,
-        'past_events': past_events,
+        'past_events': past_page,
+        'upcoming_count': counts['upcoming'],
+        'past_count': counts['past'],
+        'total_count': counts['upcoming'] + counts['past'],
         'current_filter': event_type,
+        'filter_query': urlencode({'type': event_type}) + '&' if event_type != 'all' else '',
     }
     return render(request, 'ack/events.html', context)
 
-def gallery(request):
-    # Get all gallery items ordered by date
-    gallery_items = Gallery.objects.all().order_by('-event_date', '-created_at')
-    
-    # Get filter from request
+def _gallery_summary():
+    """Photo counts and categories, recomputed only when a Gallery row changes"""
+    key = f'ack:gallery-summary:{content_version(Gallery)}'
+    summary = cache.get(key)
+    if summary is None:
+        summary = Gallery.objects.aggregate(
+            total=Count('id'),
+            featured=Count('id', filter=Q(is_featured=True)),
+        )
+        summary['categories'] = list(
+            Gallery.objects.values_list('category', flat=True).distinct().order_by('category')
+        )
+        # Other processes can't see a bump in a per-process cache; let it expire instead
+        cache.set(key, summary, None if is_shared_cache() else home_fragment_timeout())
+    return summary
+
+
+def _gallery_page(request):
     category_filter = request.GET.get('category', 'all')
     
-    print(f"DEBUG: Category filter requested: '{category_filter}'")
-    
-    # Filter by category if specified
+    gallery_items = Gallery.objects.all()
     if category_filter != 'all':
         gallery_items = gallery_items.filter(category=category_filter)
-        print(f"DEBUG: After filtering, found {gallery_items.count()} items")
-    
-    # Get featured items
-    featured_items = Gallery.objects.filter(is_featured=True)[:5]
     
-    # Get UNIQUE categories - use distinct() to avoid duplicates
-    unique_categories = Gallery.objects.values_list('category', flat=True).distinct().order_by('category')
+    page_size = getattr(settings, 'GALLERY_PAGE_SIZE', 12)
+    try:
+        items, next_cursor = gallery_keyset_page(gallery_items, request.GET.get('cursor'), page_size)
+    except InvalidCursor:
+        # Mangled or out-of-date link: start from the top rather than fail
+        items, next_cursor = gallery_keyset_page(gallery_items, None, page_size)
+    return category_filter, items, next_cursor
+
+
+@query_budget(4)
+@conditional_page(Gallery.objects.all())
+def gallery(request):
+    category_filter, gallery_items, next_cursor = _gallery_page(request)
     
-    # Debug: Print what we're getting
-    print(f"DEBUG: Unique categories: {list(unique_categories)}")
+    summary = _gallery_summary()
     
     context = {
         'gallery_items': gallery_items,
-        'featured_items': featured_items,
+        'next_cursor': next_cursor,
+        'total_photos': summary['total'],
+        'featured_count': summary['featured'],
         'current_category': category_filter,
-        'unique_categories': unique_categories,
+        'unique_categories': summary['categories'],
     }
     return render(request, 'ack/gallery.html', context)
 
 
+@query_budget(1)
+def gallery_items(request):
+    """Next page of gallery cards for infinite scroll"""
+    category_filter, gallery_items, next_cursor = _gallery_page(request)
+    html = render_to_string('ack/includes/gallery_items.html', {'gallery_items': gallery_items}, request)
+    return JsonResponse({
+        'html': html,
+        'count': len(gallery_items),
+        'next_cursor': next_cursor,
+    })
+
+
+@cached_page()
 def giving(request):
     return render(request, 'ack/giving.html')
 
+@conditional_page(Event)
 def full_calendar(request):
     events = Event.objects.all()  # Uses model ordering
     return render(request, 'ack/calendar.html', {
         'events': events
     })
 
+@cached_page()
 def ministries(request):
     return render(request, 'ack/ministries.html')
 
@@ -175,13 +241,18 @@ class SermonDetailAPIView(generics.RetrieveAPIView):
 # Event API Views
 class EventListAPIView(generics.ListAPIView):
     """API endpoint for listing events"""
-    queryset = Event.objects.all()  # Uses model ordering
+    queryset = Event.objects.all()
     serializer_class = EventListSerializer
+    pagination_class = EventCursorPagination
 
 class UpcomingEventsAPIView(generics.ListAPIView):
     """API endpoint for upcoming events"""
-    queryset = Event.objects.filter(date__gte=timezone.now())  # Uses model ordering
     serializer_class = EventListSerializer
+    pagination_class = EventCursorPagination
+
+    def get_queryset(self):
+        # Evaluated per request; a class-level queryset would freeze "now" at import
+        return upcoming_events_queryset()
 
 class EventDetailAPIView(generics.RetrieveAPIView):
     """API endpoint for single event details"""
@@ -193,7 +264,7 @@ class EventDetailAPIView(generics.RetrieveAPIView):
 def api_home(request):
     """API homepage with summary data"""
     recent_sermons = SermonEvent.objects.all()[:3]
-    upcoming_events = Event.objects.filter(date__gte=timezone.now())[:5]
+    upcoming_events = get_upcoming_events(5)
     
     event_serializer = EventListSerializer(upcoming_events, many=True)
     
@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ack.middleware.RequestIDMiddleware',
+    'ack.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,6 +100,121 @@ STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 # Media files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# Uploads are stored once per distinct content under media/blobs/
+DEFAULT_FILE_STORAGE = "ack.storage.ContentAddressedStorage"
+# Blobs stored or reused this recently are never released (an upload may be
+# about to commit a row pointing at them); collect_orphaned_media removes the rest
+BLOB_RELEASE_GRACE = 10 * 60
+# Let the front proxy send media files: "x-accel-redirect" (nginx, with an
+# internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or
+# "x-sendfile" (Apache/lighttpd). Unset, Django streams them itself.
+MEDIA_ACCEL = os.environ.get("MEDIA_ACCEL") or None
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+MEDIA_CACHE_MAX_AGE = 60 * 60
+# Media paths only staff may download. Blobs are judged by the rows that use
+# them instead (see ack.media.is_private).
+MEDIA_PRIVATE_PREFIXES = []
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Caching. Content versions (ack.cache) are bumped by whichever process saves a
+# row - any web worker, management commands, the media worker - so with more than
+# one process the cache must be shared: set REDIS_URL. Without it each process
+# keeps its own LocMemCache, which is only right for runserver and tests, and
+# the full-page cache and version-based ETags switch themselves off.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'eldoret',
+        }
+    }
+
+# List APIs are cursor-paginated (ack.pagination); clients may ask for up to
+# API_MAX_PAGE_SIZE rows per page with ?page_size=
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+# Home page "upcoming events" fragment lifetime in seconds. Admin edits
+# invalidate it immediately; the timeout only lets events drop off once they start.
+HOME_FRAGMENT_CACHE_TIMEOUT = 300
+
+# "Upcoming" events are those starting after the clock rounded down to this many
+# seconds; lists of them are reused in memory for the rest of the bucket (ack.upcoming)
+UPCOMING_EVENTS_BUCKET = 60
+
+# Full-page cache lifetime for anonymous visitors (see ack.decorators.cached_page).
+# Pages are purged as soon as a model they depend on changes.
+PAGE_CACHE_TIMEOUT = 60 * 60
+
+# Seconds the ministry dashboard statistics APIs are cached for
+MINISTRY_STATS_CACHE_TIMEOUT = 60
+
+# Past events shown per page on the events page (?past_page=)
+EVENTS_PAST_PAGE_SIZE = 12
+
+# Gallery cards per page, for the first render and each infinite-scroll fetch
+GALLERY_PAGE_SIZE = 12
+
+# Uploaded images are stored re-oriented, stripped of metadata and capped at this size
+IMAGE_UPLOAD_MAX_DIMENSION = 2048
+IMAGE_UPLOAD_QUALITY = 85
+
+# Widths (px) rendered for every uploaded image and offered to browsers via srcset
+IMAGE_RENDITION_WIDTHS = [320, 640, 1024]
+IMAGE_RENDITION_QUALITY = 80
+# Also encoded for <picture> sources, when this Pillow build supports them
+IMAGE_MODERN_FORMATS = ["avif", "webp"]
+IMAGE_AVIF_QUALITY = 60
+# Width (px) of the blurred inline previews stored in <image>_placeholder fields
+IMAGE_PLACEHOLDER_WIDTH = 16
+
+# Images without renditions yet are looked up again after this many seconds.
+# The media worker (manage.py process_media_jobs) runs in its own process, so
+# its renditions only show up at once with a shared cache (REDIS_URL).
+IMAGE_MANIFEST_RETRY = 60
+# Width (px) of the first-page previews rendered for uploaded PDFs (needs pypdfium2)
+DOCUMENT_PREVIEW_WIDTH = 480
+# Processes used by manage.py process_media_jobs (default: one per CPU)
+MEDIA_WORKER_PROCESSES = None
+
+# Logging - JSON lines to stdout, batched off the request thread.
+# Views log at DEBUG; leave LOG_LEVEL at INFO in production so those calls cost nothing.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '1.0'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'ack.log.RequestIDFilter'},
+        'sampling': {'()': 'ack.log.SamplingFilter', 'rate': LOG_SAMPLE_RATE},
+    },
+    'formatters': {
+        'json': {'()': 'ack.log.JSONFormatter'},
+    },
+    'handlers': {
+        'stdout': {
+            'class': 'ack.log.BatchingHandler',
+            'filters': ['request_id', 'sampling'],
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'ack': {'handlers': ['stdout'], 'level': LOG_LEVEL, 'propagate': False},
+        'ministries': {'handlers': ['stdout'], 'level': LOG_LEVEL, 'propagate': False},
+    },
+}
+
+# Per-request SQL query budget used when a view doesn't declare one with
+# @query_budget (None = only check views that declare a budget)
+QUERY_BUDGET_DEFAULT = None
@@ -3,11 +3,16 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from ack.media import serve_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('ack.urls')),
+    # Namespaced: its 'events' etc. would otherwise shadow ack's names on reverse()
+    path('ministries/', include(('ministries.urls', 'ministries'))),
+    # Hands the transfer to the proxy when MEDIA_ACCEL is set
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
 ]
 
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
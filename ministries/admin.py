@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.template.defaultfilters import filesizeformat
 from .models import *
 
 # Custom admin classes for better display
@@ -135,9 +136,13 @@ class YouthGalleryAdmin(admin.ModelAdmin):
 
 @admin.register(VisitorResource)
 class VisitorResourceAdmin(admin.ModelAdmin):
-    list_display = ['title', 'upload_date', 'is_active']
+    list_display = ['title', 'upload_date', 'size', 'file_page_count', 'is_active']
     list_editable = ['is_active']
 
+    def size(self, obj):
+        return filesizeformat(obj.file_size) if obj.file_size is not None else '-'
+    size.admin_order_field = 'file_size'
+
 #    list_display = ['title', 'event_type', 'date', 'time', 'location']
 #    list_filter = ['event_type', 'date']
 #    search_fields = ['title', 'description', 'location']
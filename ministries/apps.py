@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class MinistriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ministries'
+
+    def ready(self):
+        from ack.signals import track_model_changes
+        from .models import InterestFormSubmission, Ministry, MinistryMember, Program
+
+        # The statistics APIs cache their results against these models' versions
+        for model in (Ministry, MinistryMember, Program, InterestFormSubmission):
+            track_model_changes(model)
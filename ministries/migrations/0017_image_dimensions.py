@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:29
+
+import ack.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ministries', '0016_delete_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kamaleader',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='kamaleader',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='mothersunionleader',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='mothersunionleader',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sundayschoolteacher',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sundayschoolteacher',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='youthgallery',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='youthgallery',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='youthleader',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='youthleader',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='kamaleader',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='kama/leaders/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='mothersunionleader',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='mothers_union/leaders/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='sundayschoolteacher',
+            name='image',
+            field=ack.fields.SizedImageField(blank=True, height_field='image_height', null=True, upload_to='sunday_school/teachers/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='youthgallery',
+            name='image',
+            field=ack.fields.SizedImageField(height_field='image_height', upload_to='youth_gallery/', width_field='image_width'),
+        ),
+        migrations.AlterField(
+            model_name='youthleader',
+            name='image',
+            field=ack.fields.SizedImageField(height_field='image_height', upload_to='youth_leaders/', width_field='image_width'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:37
+
+import ack.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ministries', '0017_image_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitorresource',
+            name='file_page_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='visitorresource',
+            name='file_preview',
+            field=ack.fields.SizedImageField(blank=True, editable=False, height_field='file_preview_height', help_text='First page, rendered in the background', upload_to='visitor_resources/previews/', width_field='file_preview_width'),
+        ),
+        migrations.AddField(
+            model_name='visitorresource',
+            name='file_preview_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='visitorresource',
+            name='file_preview_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='visitorresource',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ministries', '0018_visitor_resource_metadata'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interestformsubmission',
+            index=models.Index(fields=['-submission_date', '-id'], name='interest_form_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(fields=['ministry', 'id'], name='program_cursor_idx'),
+        ),
+    ]
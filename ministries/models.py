@@ -1,10 +1,17 @@
 # Create your models here.
+import logging
+
 from django.db import models
 from django.core.validators import FileExtensionValidator
 from django.core.validators import EmailValidator, RegexValidator
 from django.utils import timezone
+from django.urls import reverse
 from django.conf import settings
 
+from ack.fields import SizedImageField
+
+logger = logging.getLogger(__name__)
+
 class Ministry(models.Model):
     MINISTRY_TYPES = [
         ('youth', 'Youth Ministry'),
@@ -47,6 +54,10 @@ class Program(models.Model):
     
     class Meta:
         ordering = ['ministry', 'day_of_week', 'time']
+        indexes = [
+            # Cursor pagination of the programs APIs, optionally per ministry
+            models.Index(fields=['ministry', 'id'], name='program_cursor_idx'),
+        ]
     
     def __str__(self):
         return f"{self.ministry.name} - {self.name}"
@@ -97,7 +108,9 @@ class SundaySchoolTeacher(models.Model):
     position = models.CharField(max_length=100, help_text="e.g., Nursery Class Teacher")
     age_group = models.CharField(max_length=20, choices=AGE_GROUPS)
     bio = models.TextField(blank=True, null=True)
-    image = models.ImageField(upload_to='sunday_school/teachers/', blank=True, null=True)
+    image = SizedImageField(upload_to='sunday_school/teachers/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -180,7 +193,9 @@ class MothersUnionLeader(models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=100)
     bio = models.TextField()
-    image = models.ImageField(upload_to='mothers_union/leaders/', blank=True, null=True)
+    image = SizedImageField(upload_to='mothers_union/leaders/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     order = models.IntegerField(default=0, help_text="Order of display")
@@ -353,7 +368,9 @@ class YouthLeader(models.Model):
     name = models.CharField(max_length=100)
     position = models.CharField(max_length=100)
     bio = models.TextField()
-    image = models.ImageField(upload_to='youth_leaders/')
+    image = SizedImageField(upload_to='youth_leaders/', width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -368,7 +385,9 @@ class YouthLeader(models.Model):
 # Youth Gallery Model
 class YouthGallery(models.Model):
     title = models.CharField(max_length=200)
-    image = models.ImageField(upload_to='youth_gallery/')
+    image = SizedImageField(upload_to='youth_gallery/', width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     description = models.TextField(blank=True, null=True)
     event_related = models.ForeignKey(YouthEvent, on_delete=models.SET_NULL, blank=True, null=True)
     upload_date = models.DateTimeField(auto_now_add=True)
@@ -390,12 +409,25 @@ class VisitorResource(models.Model):
         upload_to='visitor_resources/',
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
+    # Filled in from the upload (see ack.documents)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    file_page_count = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_preview = SizedImageField(
+        upload_to='visitor_resources/previews/', blank=True, editable=False,
+        width_field='file_preview_width', height_field='file_preview_height',
+        help_text="First page, rendered in the background",
+    )
+    file_preview_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_preview_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     upload_date = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
         return self.title
 
+    def get_download_url(self):
+        return reverse('ministries:download_visitor_resource', args=[self.pk])
+
 #//COMMENTED THIS IN YOUTH TEMPLATE
 # Parent Subscription Model
 #class ParentSubscription(models.Model):
@@ -456,7 +488,7 @@ def create_sample_ministries():
         )
         
         if created:
-            print(f"Created ministry: {ministry.name}")
+            logger.info("Created ministry: %s", ministry.name)
 
 def create_sample_programs():
     """Create sample program data"""
@@ -511,10 +543,10 @@ def create_sample_programs():
             )
             
             if created:
-                print(f"Created program: {program.name}")
+                logger.info("Created program: %s", program.name)
                 
     except Ministry.DoesNotExist:
-        print("Please create ministries first using create_sample_ministries()")
+        logger.warning("Please create ministries first using create_sample_ministries()")
      
 
 
@@ -551,7 +583,9 @@ class KamaLeader(models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=100)
     bio = models.TextField()
-    image = models.ImageField(upload_to='kama/leaders/', blank=True, null=True)
+    image = SizedImageField(upload_to='kama/leaders/', blank=True, null=True, width_field='image_width', height_field='image_height')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     order = models.IntegerField(default=0, help_text="Order of display")
@@ -589,6 +623,10 @@ class InterestFormSubmission(models.Model):
     class Meta:
         ordering = ['-submission_date']
         verbose_name_plural = "KAMA Membership Interest"
+        indexes = [
+            # Cursor pagination of the interest form API seeks on this
+            models.Index(fields=['-submission_date', '-id'], name='interest_form_cursor_idx'),
+        ]
     
     def __str__(self):
         return f"{self.full_name} - {self.get_ministry_type_display()} - {self.submission_date.strftime('%Y-%m-%d')}"
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.utils import timezone
+from ack.serializers import SparseFieldsetMixin
 from .models import *
 
 
-class ProgramSerializer(serializers.ModelSerializer):
+class ProgramSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     formatted_schedule = serializers.SerializerMethodField()
     
     class Meta:
@@ -19,7 +20,7 @@ class ProgramSerializer(serializers.ModelSerializer):
         return obj.time
 
 
-class MinistryMemberSerializer(serializers.ModelSerializer):
+class MinistryMemberSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     membership_duration = serializers.SerializerMethodField()
     
     class Meta:
@@ -36,7 +37,7 @@ class MinistryMemberSerializer(serializers.ModelSerializer):
         return f"{duration.days // 30} months"
 
 
-class MinistryListSerializer(serializers.ModelSerializer):
+class MinistryListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for listing ministries"""
     program_count = serializers.SerializerMethodField()
     member_count = serializers.SerializerMethodField()
@@ -49,21 +50,27 @@ class MinistryListSerializer(serializers.ModelSerializer):
             'meeting_schedule', 'location', 'program_count', 'member_count', 'active_programs'
         ]
     
+    # MinistryViewSet annotates/prefetches these for lists; the fallbacks serve single objects
     def get_program_count(self, obj):
+        if hasattr(obj, 'program_count'):
+            return obj.program_count
         return obj.programs.count()
     
     def get_member_count(self, obj):
+        if hasattr(obj, 'member_count'):
+            return obj.member_count
         return obj.members.filter(is_active=True).count()
     
     def get_active_programs(self, obj):
+        if hasattr(obj, 'first_programs'):
+            return [program.name for program in obj.first_programs]
         return list(obj.programs.values_list('name', flat=True)[:3])
 
 
-class MinistryDetailSerializer(serializers.ModelSerializer):
+class MinistryDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for single ministry view"""
     programs = ProgramSerializer(many=True, read_only=True)
     members = MinistryMemberSerializer(many=True, read_only=True)
-    upcoming_events = serializers.SerializerMethodField()
     contact_info = serializers.SerializerMethodField()
     
     class Meta:
@@ -71,9 +78,10 @@ class MinistryDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'ministry_type', 'description', 'leader_name',
             'leader_email', 'leader_phone', 'meeting_schedule', 'location',
-            'is_active', 'created_at', 'programs', 'members', 'gallery',
-            'upcoming_events', 'contact_info'
+            'is_active', 'created_at', 'programs', 'members', 'contact_info'
         ]
+        # Only with ?expand=programs,members
+        expandable_fields = ['programs', 'members']
         
     
     def get_contact_info(self, obj):
@@ -85,7 +93,7 @@ class MinistryDetailSerializer(serializers.ModelSerializer):
 
 
 
-class InterestFormSubmissionSerializer(serializers.ModelSerializer):
+class InterestFormSubmissionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     days_ago = serializers.SerializerMethodField()
     ministry_display_name = serializers.SerializerMethodField()
     requires_followup = serializers.SerializerMethodField()
@@ -1,3 +1,206 @@
-from django.test import TestCase
+import importlib.util
+import io
+import unittest
+import zipfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ack import jobs
+from ack.models import MediaJob
+from ack.testing import QueryBudgetMixin, TemporaryMediaMixin
+
+from .models import InterestFormSubmission, Ministry, MinistryMember, Program, VisitorResource
+
+
+class MinistryAPIQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for ministry_type, display_name in Ministry.MINISTRY_TYPES:
+            ministry = Ministry.objects.create(
+                name=display_name, ministry_type=ministry_type,
+                description='...', meeting_schedule='Sundays',
+            )
+            for i in range(3):
+                Program.objects.create(
+                    ministry=ministry, name=f'Program {i}', description='...',
+                    time='Sundays', location='Church Hall',
+                )
+                MinistryMember.objects.create(
+                    ministry=ministry, full_name=f'Member {i}', email=f'{ministry_type}{i}@example.com',
+                )
+        InterestFormSubmission.objects.bulk_create([
+            InterestFormSubmission(ministry_type='youth', full_name=f'Visitor {i}', email=f'v{i}@example.com')
+            for i in range(10)
+        ])
+
+    def test_ministry_stats(self):
+        cache.clear()
+        stats = self.assertWithinQueryBudget('/ministries/api/stats/').json()
+        self.assertEqual(stats['total_ministries'], len(Ministry.MINISTRY_TYPES))
+        self.assertEqual(stats['active_members'], 3 * len(Ministry.MINISTRY_TYPES))
+        self.assertEqual(stats['total_programs'], 3 * len(Ministry.MINISTRY_TYPES))
+        self.assertEqual(stats['pending_interest_forms'], 10)
+        self.assertEqual(len(stats['recent_submissions']), 5)
+
+        # Cached until one of the counted models changes
+        self.assertWithinQueryBudget('/ministries/api/stats/', budget=0)
+        MinistryMember.objects.filter(email='youth0@example.com').get().delete()
+        stats = self.assertWithinQueryBudget('/ministries/api/stats/').json()
+        self.assertEqual(stats['active_members'], 3 * len(Ministry.MINISTRY_TYPES) - 1)
+
+    def test_ministry_type_stats(self):
+        cache.clear()
+        Ministry.objects.filter(ministry_type='other').delete()
+        response = self.assertWithinQueryBudget('/ministries/api/stats/by-type/')
+        stats = {row['ministry_type']: row for row in response.json()}
+        self.assertEqual(list(stats), [ministry_type for ministry_type, _ in Ministry.MINISTRY_TYPES])
+        self.assertEqual(stats['youth']['count'], 1)
+        self.assertEqual(stats['youth']['active_programs'], 3)
+        # No ministries of this type: zero-filled rather than missing
+        self.assertEqual(stats['other']['count'], 0)
+        self.assertEqual(stats['other']['active_programs'], 0)
+        # Served from the cache until it expires
+        self.assertWithinQueryBudget('/ministries/api/stats/by-type/', budget=0)
+
+    def test_ministry_list(self):
+        # One query for the annotated ministries, one for their first programs
+        response = self.assertWithinQueryBudget('/ministries/api/ministries/')
+        self.assertEqual(response.status_code, 200)
+
+        ministries = response.json()
+        self.assertEqual(len(ministries), len(Ministry.MINISTRY_TYPES))
+        for ministry in ministries:
+            self.assertEqual(ministry['program_count'], 3)
+            self.assertEqual(ministry['member_count'], 3)
+            self.assertEqual(len(ministry['active_programs']), 3)
+
+    def test_ministry_list_query_count_is_constant(self):
+        for i in range(5):
+            ministry = Ministry.objects.create(
+                name=f'Fellowship {i}', ministry_type='other', description='...', meeting_schedule='Fridays',
+            )
+            for j in range(4):
+                Program.objects.create(ministry=ministry, name=f'Program {j}', description='...', time=f'0{j + 6}:00', location='Hall')
+            MinistryMember.objects.create(ministry=ministry, full_name='Former', email=f'former{i}@example.com', is_active=False)
+        with self.assertNumQueries(2):
+            response = self.client.get('/ministries/api/ministries/')
+
+        listed = next(item for item in response.json() if item['id'] == ministry.pk)
+        self.assertEqual(listed['program_count'], 4)
+        self.assertEqual(listed['member_count'], 0)
+        self.assertEqual(listed['active_programs'], ['Program 0', 'Program 1', 'Program 2'])
+
+    def test_ministry_list_sparse_fields(self):
+        # Unrequested counts and programs are neither annotated nor prefetched
+        with self.assertNumQueries(1):
+            response = self.client.get('/ministries/api/ministries/?fields=id,name,member_count')
+        self.assertEqual(set(response.json()[0]), {'id', 'name', 'member_count'})
+        self.assertEqual(response.json()[0]['member_count'], 3)
+
+    def test_ministry_detail_expand(self):
+        ministry = Ministry.objects.get(ministry_type='youth')
+        detail = self.client.get(f'/ministries/api/ministries/{ministry.pk}/').json()
+        self.assertNotIn('programs', detail)
+        self.assertNotIn('members', detail)
+
+        detail = self.client.get(f'/ministries/api/ministries/{ministry.pk}/?expand=programs').json()
+        self.assertEqual(len(detail['programs']), 3)
+        self.assertNotIn('members', detail)
+
+        # The ministry, its programs and its members
+        detail = self.assertWithinQueryBudget(f'/ministries/api/ministries/{ministry.pk}/?expand=programs,members')
+        self.assertEqual(len(detail.json()['members']), 3)
+
+
+def pdf_bytes(pages=2):
+    buffer = io.BytesIO()
+    first, *rest = [Image.new('RGB', (600, 800), 'white') for _ in range(pages)]
+    first.save(buffer, 'PDF', save_all=True, append_images=rest)
+    return buffer.getvalue()
+
+
+def docx_bytes(pages=7):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as docx:
+        docx.writestr('docProps/app.xml', f'<Properties><Pages>{pages}</Pages></Properties>')
+    return buffer.getvalue()
+
+
+class VisitorResourceTests(TemporaryMediaMixin, TestCase):
+    def create(self, name, content, **kwargs):
+        return VisitorResource.objects.create(
+            title='Parent Guide', description='...', file=SimpleUploadedFile(name, content), **kwargs,
+        )
+
+    def run_jobs(self):
+        for pk in jobs.claim_jobs(10):
+            self.assertEqual(jobs.run_job(pk), MediaJob.DONE)
+
+    @unittest.skipUnless(importlib.util.find_spec('pypdfium2'), "needs pypdfium2")
+    @override_settings(DOCUMENT_PREVIEW_WIDTH=120)
+    def test_pdf_page_count_and_preview(self):
+        content = pdf_bytes(pages=2)
+        resource = self.create('guide.pdf', content)
+        # Size is recorded on save, the rest by the media worker
+        self.assertEqual(resource.file_size, len(content))
+        self.assertIsNone(resource.file_page_count)
+        self.assertEqual(MediaJob.objects.get().field_name, 'file')
+
+        self.run_jobs()
+        resource.refresh_from_db()
+        self.assertEqual(resource.file_page_count, 2)
+        self.assertEqual((resource.file_preview_width, resource.file_preview_height), (120, 160))
+        with default_storage.open(resource.file_preview.name) as f:
+            self.assertEqual(Image.open(f).format, 'WEBP')
+
+    def test_docx_page_count(self):
+        resource = self.create('guide.docx', docx_bytes(pages=7))
+        self.run_jobs()
+        resource.refresh_from_db()
+        self.assertEqual(resource.file_page_count, 7)
+        self.assertFalse(resource.file_preview)
+
+    def test_download(self):
+        content = pdf_bytes()
+        resource = self.create('guide.pdf', content)
+        response = self.client.get(resource.get_download_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), content)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="parent-guide.pdf"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('Last-Modified', response)
+
+    def test_download_range(self):
+        content = pdf_bytes()
+        resource = self.create('guide.pdf', content)
+        response = self.client.get(resource.get_download_url(), HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        self.assertEqual(response['Content-Range'], f'bytes 0-3/{len(content)}')
+        self.assertEqual(response['Content-Length'], '4')
+
+    def test_inactive_resource_blob(self):
+        resource = self.create('guide.pdf', pdf_bytes())
+        url = resource.file.url
+        self.assertTrue(resource.file.name.startswith('blobs/'))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        resource.is_active = False
+        resource.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(MEDIA_ACCEL='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected-media/')
+    def test_download_through_proxy(self):
+        resource = self.create('guide.pdf', pdf_bytes())
+        response = self.client.get(resource.get_download_url())
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{resource.file.name}')
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=UTF-8''parent-guide.pdf")
+        self.assertEqual(response.content, b'')
+
+    def test_inactive_resource(self):
+        resource = self.create('guide.pdf', pdf_bytes(), is_active=False)
+        self.assertEqual(self.client.get(resource.get_download_url()).status_code, 404)
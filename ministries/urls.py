@@ -18,6 +18,7 @@ urlpatterns = [
     path('choir_worship/', views.choir_worship, name='choir_worship'),
     path('sundayschool/', views.children_ministry, name='children_ministry'),
     path('events/', views.events, name='events'),
+    path('resources/<int:pk>/download/', views.download_visitor_resource, name='download_visitor_resource'),
     
     # MOTHER'S UNION
     path('mu/', views.mothers_union_page, name='mothers_union'),
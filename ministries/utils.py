@@ -1,6 +1,10 @@
+import logging
+
 from django.core.mail import send_mail
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 def send_interest_email_notification(interest_data):
     """
     Send email notification when someone expresses interest in KAMA membership
@@ -29,8 +33,8 @@ def send_interest_email_notification(interest_data):
             fail_silently=False,
         )
         return True
-    except Exception as e:
-        print(f"Error sending email notification: {e}")
+    except Exception:
+        logger.exception("Error sending email notification")
         return False
 
 # Remove the undefined functions from imports
@@ -1,12 +1,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_safe
+from django.utils.decorators import method_decorator
+from django.utils.text import slugify
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum, Window
+from django.db.models.functions import Coalesce
 import json
+import logging
+import os
 from .models import *
 from .serializers import *
 
@@ -16,12 +22,22 @@ from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 
+from ack.cache import content_version
+from ack.decorators import conditional_page, query_budget
+from ack.media import send_file
+from ack.pagination import ProgramCursorPagination, SubmissionCursorPagination
+from ack.serializers import is_requested
+from ack.upcoming import bucket_key, upcoming_cutoff
+
+logger = logging.getLogger(__name__)
+
 
 
 # ============================================================================
 # TRADITIONAL DJANGO VIEWS - PAGE RENDERING
 # ============================================================================
 
+@conditional_page(Ministry.objects.filter(is_active=True))
 def ministries_home(request):
     ministries = Ministry.objects.filter(is_active=True)
     context = {
@@ -31,6 +47,10 @@ def ministries_home(request):
     }
     return render(request, 'ministries/ministries_home.html', context)
 
+@conditional_page(
+    Ministry, Program, WeeklyProgram, YouthEvent, YouthLeader, YouthGallery, VisitorResource,
+    key=bucket_key,
+)
 def youth_ministry(request):
     try:
         ministry = get_object_or_404(Ministry, ministry_type='youth', is_active=True)
@@ -40,9 +60,8 @@ def youth_ministry(request):
         weekly_template_programs = WeeklyProgram.objects.filter(is_active=True).order_by('order', 'name')  # For template
         
         # Use YouthEvent for upcoming events
-        from datetime import datetime
         upcoming_events = YouthEvent.objects.filter(
-            event_date__gte=datetime.now()
+            event_date__gte=upcoming_cutoff()
         ).order_by('event_date')[:5]
         
         # Get youth leaders
@@ -81,18 +100,11 @@ def youth_ministry(request):
     
     return render(request, 'ministries/youth.html', context)
 
+@conditional_page(SundaySchoolSchedule, ScheduleItem, SundaySchoolTeacher, SundaySchoolInfo, InfoItem)
 def children_ministry(request):
     """
     Sunday School - Children Ministry page
     """
-    # DEBUG: Check if URL resolves
-    from django.urls import reverse
-    try:
-        url = reverse('submit_sunday_school_registration')
-        print(f"DEBUG: URL found: {url}")
-    except Exception as e:
-        print(f"DEBUG: URL error: {e}")
-    
     try:
         # Get Sunday School schedules with their items
         schedules = SundaySchoolSchedule.objects.filter(is_active=True).prefetch_related('items')
@@ -114,8 +126,8 @@ def children_ministry(request):
         
         return render(request, 'ministries/sundayschool.html', context)
         
-    except Exception as e:
-        print(f"Error loading Sunday School data: {e}")
+    except Exception:
+        logger.exception("Error loading Sunday School data")
         # Fallback context
         context = {
             'schedules': [],
@@ -126,9 +138,9 @@ def children_ministry(request):
         }
         return render(request, 'ministries/sundayschool.html', context)
 
+@conditional_page(Ministry, Program, MusicMinistryTeam)
 def choir_ministry(request):
-    print("🎵 DEBUG: choir_ministry view is DEFINITELY being called!")
-    print("🎵 DEBUG: Request path:", request.path)
+    logger.debug("choir_ministry called for %s", request.path)
     
     try:
         ministry = get_object_or_404(Ministry, ministry_type='choir', is_active=True)
@@ -137,10 +149,6 @@ def choir_ministry(request):
         # Get music ministry teams
         music_teams = MusicMinistryTeam.objects.filter(is_active=True).order_by('order', 'name')
         
-        print(f"🎵 DEBUG: Found {music_teams.count()} music teams")
-        for team in music_teams:
-            print(f"🎵 DEBUG: Team - {team.name}")
-        
         context = {
             'title': "Choir & Worship Ministry",
             'page_description': ministry.description,
@@ -150,7 +158,7 @@ def choir_ministry(request):
             'music_teams': music_teams,
         }
     except Ministry.DoesNotExist:
-        print("🎵 DEBUG: Ministry not found, using fallback")
+        logger.debug("Choir ministry not found, using fallback context")
         music_teams = MusicMinistryTeam.objects.filter(is_active=True).order_by('order', 'name')
         
         context = {
@@ -161,14 +169,12 @@ def choir_ministry(request):
             'music_teams': music_teams,
         }
     
-    print("🎵 DEBUG: Rendering template with context")
     return render(request, 'ministries/choir_worship.html', context)
 
 def choir_worship(request):
-    print("🎵 DEBUG: choir_worship view is DEFINITELY being called!")
-    print("🎵 DEBUG: Request path:", request.path)
     return choir_ministry(request)
 
+@conditional_page(Ministry, MothersUnionActivity, MothersUnionLeader, MothersUnionEvent)
 def mothers_union_page(request):
     # Fetch all active Mother's Union data
     activities = MothersUnionActivity.objects.filter(is_active=True).order_by('order')
@@ -196,6 +202,7 @@ def mothers_union_page(request):
     }
     return render(request, 'ministries/mu.html', context)
 
+@conditional_page(Ministry, KamaMotto, KamaActivity, KamaLeader)
 def men_ministry(request):
     """
     KAMA - Men Ministry page
@@ -227,8 +234,8 @@ def men_ministry(request):
         # Make sure the template path is correct
         return render(request, 'ministries/kama.html', context)
         
-    except Exception as e:
-        print(f"Error loading KAMA data: {e}")
+    except Exception:
+        logger.exception("Error loading KAMA data")
         # Fallback context
         context = {
             'motto': None,
@@ -261,9 +268,19 @@ def events(request):
     
     return render(request, 'events.html', context)
 
+@require_safe
+def download_visitor_resource(request, pk):
+    """Visitor resource as an attachment, resumable with Range requests"""
+    resource = get_object_or_404(VisitorResource, pk=pk, is_active=True)
+    extension = os.path.splitext(resource.file.name)[1]
+    return send_file(
+        request, resource.file.name, as_attachment=True,
+        filename=f'{slugify(resource.title) or "resource"}{extension}',
+        cache_control=f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}",
+    )
+
 def ministry_detail(request, ministry_type):
-    print(f"🎵 DEBUG: ministry_detail called with ministry_type: '{ministry_type}'")
-    print(f"🎵 DEBUG: Request path: {request.path}")
+    logger.debug("ministry_detail called with ministry_type=%r", ministry_type)
     
     try:
         ministry = get_object_or_404(Ministry, ministry_type=ministry_type, is_active=True)
@@ -291,7 +308,7 @@ def ministry_detail(request, ministry_type):
 def submit_membership_interest(request):
     if request.method == 'POST':
         try:
-            print("Received membership interest request")  # Debug log
+            logger.debug("Received membership interest request")
             
             # Get form data - handle both FormData and JSON
             if request.content_type == 'application/json':
@@ -308,7 +325,7 @@ def submit_membership_interest(request):
                 phone = request.POST.get('phone')
                 message = request.POST.get('message')
             
-            print(f"Form data: {full_name}, {email}, {phone}")  # Debug log
+            logger.debug("Membership interest from %s <%s>", full_name, email)
             
             # Validate required fields
             if not all([full_name, email, message]):
@@ -325,7 +342,7 @@ def submit_membership_interest(request):
                 message=message
             )
             
-            print(f"Membership saved with ID: {membership.id}")  # Debug log
+            logger.info("Membership interest saved", extra={'membership_id': membership.id})
             
             # Send WhatsApp message to secretary
             send_whatsapp_notification(membership)
@@ -335,8 +352,8 @@ def submit_membership_interest(request):
                 'message': 'Thank you for your interest! We will contact you soon.'
             })
             
-        except Exception as e:
-            print(f"Error in submit_membership_interest: {str(e)}")  # Debug log
+        except Exception:
+            logger.exception("Error in submit_membership_interest")
             return JsonResponse({
                 'status': 'error',
                 'message': 'An error occurred. Please try again.'
@@ -446,11 +463,38 @@ def submit_music_ministry_registration(request):
 # API VIEWSETS AND CLASS-BASED VIEWS
 # ============================================================================
 
+def _ministry_count(model, **filters):
+    """Per-ministry row count of ``model`` as a correlated subquery (no join fan-out)"""
+    rows = (
+        model.objects.filter(ministry=OuterRef('pk'), **filters)
+        .order_by().values('ministry').annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+@method_decorator(query_budget(2), name='list')
+@method_decorator(query_budget(3), name='retrieve')
 class MinistryViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for ministries"""
     queryset = Ministry.objects.filter(is_active=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Everything MinistryListSerializer shows, in two queries however many
+            # ministries there are, skipping whatever ?fields= leaves out
+            request = self.request
+            if is_requested(request, 'program_count'):
+                queryset = queryset.annotate(program_count=_ministry_count(Program))
+            if is_requested(request, 'member_count'):
+                queryset = queryset.annotate(member_count=_ministry_count(MinistryMember, is_active=True))
+            if is_requested(request, 'active_programs'):
+                queryset = queryset.prefetch_related(
+                    Prefetch('programs', queryset=Program.objects.only('id', 'ministry_id', 'name')[:3],
+                             to_attr='first_programs'),
+                )
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'list':
             return MinistryListSerializer
@@ -481,6 +525,7 @@ class InterestFormSubmissionViewSet(viewsets.ModelViewSet):
     """API endpoint for interest form submissions"""
     queryset = InterestFormSubmission.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = SubmissionCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -496,18 +541,20 @@ class InterestFormSubmissionViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def pending(self, request):
-        pending = self.get_queryset().filter(is_contacted=False)
+        pending = self.paginate_queryset(self.get_queryset().filter(is_contacted=False))
         serializer = self.get_serializer(pending, many=True)
-        return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
 class ProgramListAPIView(generics.ListAPIView):
     """API endpoint for all programs"""
     queryset = Program.objects.all()
     serializer_class = ProgramSerializer
+    pagination_class = ProgramCursorPagination
 
 class MinistryProgramsAPIView(generics.ListAPIView):
     """API endpoint for programs by ministry"""
     serializer_class = ProgramSerializer
+    pagination_class = ProgramCursorPagination
     
     def get_queryset(self):
         ministry_type = self.kwargs['ministry_type']
@@ -517,43 +564,68 @@ class MinistryProgramsAPIView(generics.ListAPIView):
 # API FUNCTION-BASED VIEWS
 # ============================================================================
 
+MINISTRY_STATS_KEY = 'ministries:stats:{}'
+MINISTRY_TYPE_STATS_KEY = 'ministries:type-stats:{}'
+
+# Saving or deleting any of these invalidates the cached statistics (tracked in MinistriesConfig.ready)
+STATS_MODELS = (Ministry, MinistryMember, Program, InterestFormSubmission)
+
+
+def stats_cache_timeout():
+    return getattr(settings, 'MINISTRY_STATS_CACHE_TIMEOUT', 60)
+
+
+@query_budget(2)
 @api_view(['GET'])
 def ministry_stats(request):
     """API endpoint for ministry statistics"""
-    total_ministries = Ministry.objects.filter(is_active=True).count()
-    active_members = MinistryMember.objects.filter(is_active=True).count()
-    total_programs = Program.objects.count()
-    pending_interest_forms = InterestFormSubmission.objects.filter(is_contacted=False).count()
-    recent_submissions = InterestFormSubmission.objects.filter(is_contacted=False)[:5]
-    
-    stats = {
-        'total_ministries': total_ministries,
-        'active_members': active_members,
-        'total_programs': total_programs,
-        'pending_interest_forms': pending_interest_forms,
-        'recent_submissions': InterestFormSubmissionSerializer(recent_submissions, many=True).data
-    }
-    
-    serializer = MinistryStatsSerializer(stats)
-    return Response(serializer.data)
+    key = MINISTRY_STATS_KEY.format(content_version(*STATS_MODELS))
+    data = cache.get(key)
+    if data is None:
+        # Members and programs always belong to a ministry, so summing the
+        # per-ministry counts gives the totals in the same query
+        counts = Ministry.objects.order_by().aggregate(
+            total_ministries=Count('pk', filter=Q(is_active=True)),
+            active_members=Coalesce(Sum(_ministry_count(MinistryMember, is_active=True)), 0),
+            total_programs=Coalesce(Sum(_ministry_count(Program)), 0),
+        )
+        # Every row carries the pending total, counted before the LIMIT
+        recent_submissions = list(
+            InterestFormSubmission.objects.filter(is_contacted=False)
+            .annotate(pending_total=Window(Count('pk')))[:5]
+        )
+        counts['pending_interest_forms'] = recent_submissions[0].pending_total if recent_submissions else 0
+        data = MinistryStatsSerializer({**counts, 'recent_submissions': recent_submissions}).data
+        cache.set(key, data, stats_cache_timeout())
+    return Response(data)
 
+@query_budget(1)
 @api_view(['GET'])
 def ministry_type_stats(request):
     """API endpoint for statistics by ministry type"""
-    stats = []
-    for ministry_type, display_name in Ministry.MINISTRY_TYPES:
-        ministries = Ministry.objects.filter(ministry_type=ministry_type, is_active=True)
-        program_count = Program.objects.filter(ministry__ministry_type=ministry_type).count()
-        
-        stats.append({
-            'ministry_type': ministry_type,
-            'display_name': display_name,
-            'count': ministries.count(),
-            'active_programs': program_count
-        })
-    
-    serializer = MinistryTypeStatsSerializer(stats, many=True)
-    return Response(serializer.data)
+    key = MINISTRY_TYPE_STATS_KEY.format(content_version(Ministry, Program))
+    data = cache.get(key)
+    if data is None:
+        # One GROUP BY for every type; types with no ministries are filled in below
+        counts = {
+            row['ministry_type']: row
+            for row in Ministry.objects.order_by().values('ministry_type').annotate(
+                count=Count('pk', filter=Q(is_active=True), distinct=True),
+                active_programs=Count('programs'),
+            )
+        }
+        stats = [
+            {
+                'ministry_type': ministry_type,
+                'display_name': display_name,
+                'count': counts.get(ministry_type, {}).get('count', 0),
+                'active_programs': counts.get(ministry_type, {}).get('active_programs', 0),
+            }
+            for ministry_type, display_name in Ministry.MINISTRY_TYPES
+        ]
+        data = MinistryTypeStatsSerializer(stats, many=True).data
+        cache.set(key, data, stats_cache_timeout())
+    return Response(data)
 
 @api_view(['POST'])
 def submit_interest_form(request):
@@ -566,9 +638,9 @@ def submit_interest_form(request):
         # Send email notification
         try:
             send_interest_email_notification(submission)
-        except Exception as e:
+        except Exception:
             # Log error but don't fail the request
-            print(f"Email sending failed: {e}")
+            logger.warning("Email sending failed", exc_info=True)
         
         return Response(
             {'status': 'success', 'message': 'Thank you for your interest!'},
@@ -590,7 +662,7 @@ def submit_membership_interest(request):
     """
     Handle Mother's Union membership interest form submissions
     """
-    print("📝 DEBUG: submit_membership_interest called")  # Debug log
+    logger.debug("submit_membership_interest called")
     
     try:
         # Parse JSON data
@@ -600,19 +672,17 @@ def submit_membership_interest(request):
             # Handle form data
             data = request.POST
         
-        print(f"📝 DEBUG: Received data: {data}")  # Debug log
-        
         # Extract form data
         full_name = data.get('full_name')
         email = data.get('email')
         phone = data.get('phone')
         message = data.get('message')
         
-        print(f"📝 DEBUG: Form data - Name: {full_name}, Email: {email}, Phone: {phone}")  # Debug log
+        logger.debug("Membership interest from %s <%s>", full_name, email)
         
         # Validate required fields
         if not all([full_name, email, message]):
-            print("❌ DEBUG: Missing required fields")
+            logger.debug("Membership interest missing required fields")
             return JsonResponse({
                 'status': 'error',
                 'message': 'Please fill in all required fields: Name, Email, and Message are required.'
@@ -637,10 +707,10 @@ def submit_membership_interest(request):
                 phone=phone.strip() if phone else '',
                 message=message.strip()
             )
-            print(f"✅ DEBUG: Membership saved with ID: {membership.id}")  # Debug log
+            logger.info("Membership interest saved", extra={'membership_id': membership.id})
             
-        except Exception as db_error:
-            print(f"❌ DEBUG: Database error: {db_error}")
+        except Exception:
+            logger.exception("Database error saving membership interest")
             return JsonResponse({
                 'status': 'error',
                 'message': 'Database error. Please try again.'
@@ -649,17 +719,15 @@ def submit_membership_interest(request):
         # Send WhatsApp notification
         try:
             send_whatsapp_notification(membership)
-            print("✅ DEBUG: WhatsApp notification sent")
-        except Exception as whatsapp_error:
-            print(f"⚠️ DEBUG: WhatsApp notification failed: {whatsapp_error}")
+        except Exception:
+            logger.warning("WhatsApp notification failed", exc_info=True)
             # Don't fail the request if WhatsApp fails
         
         # Send email notification
         try:
             send_email_notification(membership)
-            print("✅ DEBUG: Email notification sent")
-        except Exception as email_error:
-            print(f"⚠️ DEBUG: Email notification failed: {email_error}")
+        except Exception:
+            logger.warning("Email notification failed", exc_info=True)
             # Don't fail the request if email fails
         
         return JsonResponse({
@@ -667,17 +735,15 @@ def submit_membership_interest(request):
             'message': 'Thank you for your interest in Mother\'s Union! We will contact you soon.'
         })
         
-    except json.JSONDecodeError as e:
-        print(f"❌ DEBUG: JSON decode error: {e}")
+    except json.JSONDecodeError:
+        logger.debug("Membership interest with invalid JSON body")
         return JsonResponse({
             'status': 'error',
             'message': 'Invalid form data. Please try again.'
         }, status=400)
         
-    except Exception as e:
-        print(f"❌ DEBUG: Unexpected error: {str(e)}")
-        import traceback
-        print(f"❌ DEBUG: Traceback: {traceback.format_exc()}")
+    except Exception:
+        logger.exception("Unexpected error in submit_membership_interest")
         return JsonResponse({
             'status': 'error',
             'message': 'An unexpected error occurred. Please try again.'
@@ -710,8 +776,7 @@ def send_whatsapp_notification(membership):
 
 Please follow up within 48 hours. 🙏"""
         
-        print(f"📱 DEBUG: WhatsApp notification ready for: {secretary_phone}")
-        print(f"📱 DEBUG: Message content: {message}")
+        logger.debug("WhatsApp notification ready for %s", secretary_phone)
         
         # If you have Twilio configured, use it
         if hasattr(settings, 'TWILIO_ACCOUNT_SID') and settings.TWILIO_ACCOUNT_SID:
@@ -724,21 +789,21 @@ Please follow up within 48 hours. 🙏"""
                     from_=settings.TWILIO_WHATSAPP_NUMBER,
                     to=f'whatsapp:{secretary_phone}'
                 )
-                print(f"✅ WhatsApp message sent via Twilio: {whatsapp_message.sid}")
+                logger.info("WhatsApp message sent via Twilio", extra={'sid': whatsapp_message.sid})
                 return True
-            except Exception as twilio_error:
-                print(f"❌ Twilio error: {twilio_error}")
+            except Exception:
+                logger.warning("Twilio error", exc_info=True)
         
         # Fallback: Create WhatsApp link for manual sending
         encoded_message = message.replace(' ', '%20').replace('\n', '%0A')
         whatsapp_url = f"https://wa.me/{secretary_phone}?text={encoded_message}"
-        print(f"📱 Manual WhatsApp URL: {whatsapp_url}")
+        logger.debug("Manual WhatsApp URL: %s", whatsapp_url)
         
         # Return the URL for the frontend to use
         return whatsapp_url
             
-    except Exception as e:
-        print(f"❌ Error in send_whatsapp_notification: {e}")
+    except Exception:
+        logger.exception("Error in send_whatsapp_notification")
         return None
 
 
@@ -778,11 +843,10 @@ def send_email_notification(membership):
             recipient_list=[recipient_email],
             fail_silently=True,  # Don't raise exception if email fails
         )
-        print("✅ Email notification sent successfully")
         return True
         
-    except Exception as e:
-        print(f"❌ Error sending email: {e}")
+    except Exception:
+        logger.exception("Error sending email notification")
         return False
 
 
@@ -832,8 +896,8 @@ def handle_interest_form(request, ministry_type):
             # Send email notification
             try:
                 send_interest_email_notification(submission)
-            except Exception as e:
-                print(f"Email sending failed: {e}")
+            except Exception:
+                logger.warning("Email sending failed", exc_info=True)
             
             return JsonResponse({
                 'status': 'success', 
@@ -871,8 +935,7 @@ Submitted on: {membership.created_at.strftime('%Y-%m-%d %H:%M')}
 
 Please follow up within 48 hours."""
         
-        print(f"📱 WhatsApp notification ready for: {secretary_phone}")
-        print(f"📱 Message content: {message}")
+        logger.debug("WhatsApp notification ready for %s", secretary_phone)
         
         # If you have Twilio configured, you can use it here
         if hasattr(settings, 'TWILIO_ACCOUNT_SID') and settings.TWILIO_ACCOUNT_SID:
@@ -884,14 +947,13 @@ Please follow up within 48 hours."""
                 from_=settings.TWILIO_WHATSAPP_NUMBER,
                 to=f'whatsapp:{secretary_phone}'
             )
-            print(f"✅ WhatsApp message sent via Twilio: {whatsapp_message.sid}")
+            logger.info("WhatsApp message sent via Twilio", extra={'sid': whatsapp_message.sid})
         else:
             # Log for manual sending
-            print(f"📱 Manual WhatsApp message for {secretary_phone}:")
-            print(f"📱 Content: {message}")
+            logger.info("Manual WhatsApp message for %s:\n%s", secretary_phone, message)
             
-    except Exception as e:
-        print(f"❌ Error sending WhatsApp: {e}")
+    except Exception:
+        logger.exception("Error sending WhatsApp")
 
 
 def send_email_notification(membership):
@@ -915,9 +977,8 @@ def send_email_notification(membership):
             ['wanyamakelvin47@gmail.com'],  # Replace with actual email
             fail_silently=False,
         )
-        print("Email notification sent")
-    except Exception as e:
-        print(f"Error sending email: {e}")
+    except Exception:
+        logger.exception("Error sending email")
 
 def send_music_ministry_whatsapp_notification(registration):
     """Send WhatsApp notifications to relevant team leaders"""
@@ -934,8 +995,8 @@ def send_music_ministry_whatsapp_notification(registration):
             if team.leader_phone:
                 send_whatsapp_to_leader(registration, team)
                 
-    except Exception as e:
-        print(f"Error sending WhatsApp notifications: {e}")
+    except Exception:
+        logger.exception("Error sending WhatsApp notifications")
 
 def send_whatsapp_to_leader(registration, team):
     """Send individual WhatsApp message to team leader"""
@@ -967,12 +1028,12 @@ Please follow up within 48 hours.
                 from_=settings.TWILIO_WHATSAPP_NUMBER,
                 to=f'whatsapp:{team.leader_phone}'
             )
-            print(f"WhatsApp sent to {team.leader_name}: {message.sid}")
+            logger.info("WhatsApp sent to %s", team.leader_name, extra={'sid': message.sid})
         else:
-            print(f"WhatsApp notification for {team.leader_name}: New registration from {registration.full_name}")
+            logger.info("WhatsApp notification for %s: New registration from %s", team.leader_name, registration.full_name)
             
-    except Exception as e:
-        print(f"Error sending WhatsApp to {team.leader_name}: {e}")
+    except Exception:
+        logger.exception("Error sending WhatsApp to %s", team.leader_name)
 
 def send_interest_email_notification(submission):
     """Send email notification for new interest form submission"""